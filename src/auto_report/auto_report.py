@@ -16,6 +16,7 @@ from hy_river import get_usgs_stations
 
 # from hdf_utils import get_hdf_geom, get_hdf_plan
 from hdf_utils import (
+    cached_ras_hdf_files,
     get_bulk_hdf_geom,
     get_bulk_hdf_plan,
 )
@@ -478,6 +479,24 @@ async def auto_report(
     print("The report has been successfully generated.")
 
 
+async def _run_with_cached_hdf_files(report_run):
+    """
+    Run a report, sharing the RAS HDF files opened during the run and closing
+    them once it ends, whether it succeeds or fails
+
+    Parameters
+    ----------
+    report_run : coroutine
+        The auto_report coroutine to run
+
+    Returns
+    -------
+    None
+    """
+    with cached_ras_hdf_files():
+        await report_run
+
+
 def main_auto_report(
     hdf_geom_file_path: str,
     hdf_plan_files: list,
@@ -538,40 +557,44 @@ def main_auto_report(
     # Use asyncio.run if not in an already running event loop
     if not asyncio.get_event_loop().is_running():
         asyncio.run(
-            auto_report(
-                hdf_geom_file_path,
-                hdf_plan_files,
-                nlcd_file_path,
-                report_file_path,
-                report_keywords,
-                input_domain_id,
-                gage_collection_method,
-                stream_frequency_threshold,
-                wse_error_threshold,
-                num_bins,
-                nid_parquet_file_path,
-                nid_dam_height,
-                session_data_dir,
-                active_streamlit,
+            _run_with_cached_hdf_files(
+                auto_report(
+                    hdf_geom_file_path,
+                    hdf_plan_files,
+                    nlcd_file_path,
+                    report_file_path,
+                    report_keywords,
+                    input_domain_id,
+                    gage_collection_method,
+                    stream_frequency_threshold,
+                    wse_error_threshold,
+                    num_bins,
+                    nid_parquet_file_path,
+                    nid_dam_height,
+                    session_data_dir,
+                    active_streamlit,
+                )
             )
         )
     else:
         # If already in an event loop, use create_task
         asyncio.create_task(
-            auto_report(
-                hdf_geom_file_path,
-                hdf_plan_files,
-                nlcd_file_path,
-                report_file_path,
-                report_keywords,
-                input_domain_id,
-                gage_collection_method,
-                stream_frequency_threshold,
-                wse_error_threshold,
-                num_bins,
-                nid_parquet_file_path,
-                nid_dam_height,
-                session_data_dir,
-                active_streamlit,
+            _run_with_cached_hdf_files(
+                auto_report(
+                    hdf_geom_file_path,
+                    hdf_plan_files,
+                    nlcd_file_path,
+                    report_file_path,
+                    report_keywords,
+                    input_domain_id,
+                    gage_collection_method,
+                    stream_frequency_threshold,
+                    wse_error_threshold,
+                    num_bins,
+                    nid_parquet_file_path,
+                    nid_dam_height,
+                    session_data_dir,
+                    active_streamlit,
+                )
             )
         )
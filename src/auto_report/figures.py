@@ -2,8 +2,15 @@
 
 # Imports #####################################################################
 
-from typing import Optional
+from typing import Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+import multiprocessing as mp
+import io
 import os
+import re
+import tempfile
 import pandas as pd
 import numpy as np
 import xarray as xr
@@ -13,11 +20,13 @@ import streamlit as st
 import contextily as ctx
 import rioxarray as rxr
 import geopandas as gpd
+import shapely
 from rashdf import RasPlanHdf
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.gridspec as gridspec
 import matplotlib.ticker as ticker
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.colors import ListedColormap, BoundaryNorm
 from matplotlib.lines import Line2D
 from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -36,7 +45,12 @@ from hy_river import (
     get_nwis,
     filter_nid,
 )
-from hdf_utils import get_model_perimeter, get_plan_cell_points
+from hdf_utils import (
+    calc_time_to_peak,
+    get_model_perimeter,
+    get_plan_cell_points,
+    open_ras_hdf,
+)
 from metrics import calc_metrics
 from tables import fill_calibration_metrics_table, fill_computation_settings_table
 
@@ -44,8 +58,75 @@ warnings.filterwarnings("ignore")
 
 # assign a global font size for the plots
 plt.rcParams.update({"font.size": 16})
+# Drop sub-pixel vertices from long polylines (e.g. NHD streams) when rendering
+plt.rcParams.update({"path.simplify": True, "path.simplify_threshold": 1.0})
+# Favor fast PNG encoding over file size when saving the report figures
+_PNG_KWARGS = {"compress_level": 1}
+# Persist the basemap tiles on disk so repeated report builds do not re-download them
+CTX_CACHE_DIR = os.environ.get(
+    "CTX_CACHE", os.path.join(tempfile.gettempdir(), "ctx_cache")
+)
+os.makedirs(CTX_CACHE_DIR, exist_ok=True)
+ctx.set_cache_dir(CTX_CACHE_DIR)
+# Skip the basemap tile downloads entirely when working offline
+CTX_OFFLINE = os.environ.get("CTX_OFFLINE", "").lower() in ("1", "true", "yes")
 # Set the display option for floating-point numbers to show only 3 decimal places
 pd.options.display.float_format = "{:.3f}".format
+# Land cover class names and color pallet of the NLCD dataset
+_NLCD_CLASS_NAMES = {
+    11: "Open Water",
+    12: "Perennial Ice/Snow",
+    21: "Developed, Open Space",
+    22: "Developed, Low Intensity",
+    23: "Developed, Medium Intensity",
+    24: "Developed, High Intensity",
+    31: "Barren Land (Rock/Sand/Clay)",
+    41: "Deciduous Forest",
+    42: "Evergreen Forest",
+    43: "Mixed Forest",
+    51: "Dwarf Scrub",
+    52: "Shrub/Scrub",
+    71: "Grassland/Herbaceous",
+    72: "Sedge/Herbaceous",
+    73: "Lichens",
+    74: "Moss",
+    81: "Pasture/Hay",
+    82: "Cultivated Crops",
+    90: "Woody Wetlands",
+    95: "Emergent Herbaceous Wetlands",
+}
+_NLCD_COLORS = {
+    11: "#486DA2",  # Open Water
+    12: "#E7EFFC",  # Perennial Ice/Snow
+    21: "#E1CDCE",  # Developed, Open Space
+    22: "#DC9881",  # Developed, Low Intensity
+    23: "#F10100",  # Developed, Medium Intensity
+    24: "#AB0101",  # Developed, High Intensity
+    31: "#B3AFA4",  # Barren Land (Rock/Sand/Clay)
+    41: "#6CA966",  # Deciduous Forest
+    42: "#1D6533",  # Evergreen Forest
+    43: "#BDCC93",  # Mixed Forest
+    51: "#B49E48",  # Dwarf Scrub
+    52: "#D1BB82",  # Shrub/Scrub
+    71: "#EDECCD",  # Grassland/Herbaceous
+    72: "#D0D181",  # Sedge/Herbaceous
+    73: "#A4CC51",  # Lichens
+    74: "#82BA9D",  # Moss
+    81: "#DDD83E",  # Pasture/Hay
+    82: "#AE7229",  # Cultivated Crops
+    90: "#BBD7ED",  # Woody Wetlands
+    95: "#71A4C1",  # Emergent Herbaceous Wetlands
+}
+# Number of 2D cells above which individual cell outlines merge into a solid fill
+_MAX_MESH_CELLS = 50000
+# Report keywords are wrapped in guillemets, e.g. «figure_dem»
+_KEYWORD_PATTERN = re.compile(r"«[^«»]+»")
+# Concurrent NWIS requests, kept small to stay within the service's rate limits
+_NWIS_MAX_WORKERS = 4
+# Number of gages from which the hydrographs are plotted in parallel processes
+_MIN_PARALLEL_GAGES = 8
+# The hydrograph figure of a worker process, set by _init_hydrograph_worker
+_worker_figure = None
 # Functions ###################################################################
 
 
@@ -78,7 +159,86 @@ def calc_aep(data: pd.DataFrame):
     return df_sorted
 
 
-def add_image_to_keyword(report_document: Document, keyword: str, image_path: str):
+def _monthly_mean(dates: pd.DatetimeIndex, values: np.ndarray):
+    """
+    Calculate the mean of a daily time series for each calendar month
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        The dates of the daily time series
+    values : np.ndarray
+        The daily values
+
+    Returns
+    -------
+    monthly : pd.Series
+        The mean value for each calendar month present in the time series
+    """
+    months = dates.month.to_numpy() - 1
+    present = np.bincount(months, minlength=12) > 0
+    valid = ~np.isnan(values)
+    # Sum and count the valid values for each month in a single pass
+    counts = np.bincount(months[valid], minlength=12)
+    sums = np.bincount(months[valid], weights=values[valid], minlength=12)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        monthly = (sums / counts)[present]
+    return pd.Series(monthly, index=np.arange(1, 13)[present])
+
+
+def _annual_max(dates: pd.DatetimeIndex, values: np.ndarray):
+    """
+    Calculate the maximum of a daily time series for each calendar year
+
+    Parameters
+    ----------
+    dates : pd.DatetimeIndex
+        The sorted dates of the daily time series
+    values : np.ndarray
+        The daily values
+
+    Returns
+    -------
+    annual : pd.Series
+        The maximum value for each calendar year in the time series
+    """
+    years = dates.year.to_numpy()
+    if len(years) == 0:
+        return pd.Series(dtype=float)
+    # Locate the first record of each year and reduce between them, ignoring NaN
+    starts = np.r_[0, np.flatnonzero(np.diff(years)) + 1]
+    return pd.Series(np.fmax.reduceat(values, starts), index=years[starts])
+
+
+def _keyword_index(report_document: Document):
+    """
+    Map each keyword within a document to the paragraphs that contain it. The
+    index is built on the first call and stored on the document for later calls.
+
+    Parameters
+    ----------
+    report_document : Docx Document
+        The document to index
+
+    Returns
+    -------
+    keyword_index : dict
+        The lowercase keywords mapped to the list of paragraphs containing them
+    """
+    keyword_index = getattr(report_document, "_kw_index", None)
+    if keyword_index is None:
+        keyword_index = {}
+        # Iterate through paragraphs once
+        for para in report_document.paragraphs:
+            for keyword in set(_KEYWORD_PATTERN.findall(para.text.lower())):
+                keyword_index.setdefault(keyword, []).append(para)
+        report_document._kw_index = keyword_index
+    return keyword_index
+
+
+def add_image_to_keyword(
+    report_document: Document, keyword: str, image_path: Union[str, io.BytesIO]
+):
     """
     Add an image to a keyword within a document
 
@@ -88,8 +248,8 @@ def add_image_to_keyword(report_document: Document, keyword: str, image_path: st
         The document to modify
     keyword : str
         The keyword to search for in the document
-    image_path : str
-        The file path to the image to add
+    image_path : str or io.BytesIO
+        The file path to the image to add, or an in-memory image stream
 
     Returns
     -------
@@ -98,18 +258,181 @@ def add_image_to_keyword(report_document: Document, keyword: str, image_path: st
 
     """
 
-    # Iterate through paragraphs
-    for para in report_document.paragraphs:
-        if keyword.lower() in para.text.lower():
-            # Add image to a new paragraph before the keyword
-            p = para.insert_paragraph_before()
-            run = p.add_run()
-            run.add_picture(image_path, width=Inches(6))
+    # Look up the paragraphs containing the keyword
+    if _KEYWORD_PATTERN.fullmatch(keyword):
+        paragraphs = _keyword_index(report_document).get(keyword.lower(), [])
+    else:
+        paragraphs = [
+            para
+            for para in report_document.paragraphs
+            if keyword.lower() in para.text.lower()
+        ]
+    for para in paragraphs:
+        # Add image to a new paragraph before the keyword
+        p = para.insert_paragraph_before()
+        run = p.add_run()
+        if not isinstance(image_path, str):
+            # Rewind the stream in case the image is added more than once
+            image_path.seek(0)
+        run.add_picture(image_path, width=Inches(6))
 
     # return the modified document
     return report_document
 
 
+def _save_figure(fig: plt.Figure, image_path: str, in_memory: bool = False):
+    """
+    Save a figure as a PNG image, either to disk or to an in-memory stream
+
+    Parameters
+    ----------
+    fig : plt.Figure
+        The figure to save
+    image_path : str
+        The file path to save the image to when not saving in memory
+    in_memory : bool
+        Whether to save the image to an in-memory stream instead of disk
+
+    Returns
+    -------
+    image : str or io.BytesIO
+        The file path to the saved image, or the in-memory image stream
+    """
+    if in_memory:
+        image = io.BytesIO()
+        fig.savefig(image, format="png", bbox_inches="tight", pil_kwargs=_PNG_KWARGS)
+        image.seek(0)
+        return image
+    fig.savefig(image_path, bbox_inches="tight", pil_kwargs=_PNG_KWARGS)
+    return image_path
+
+
+def _line_segments(geometries: gpd.GeoSeries):
+    """
+    Split (multi)line geometries into a list of coordinate arrays
+
+    Parameters
+    ----------
+    geometries : gpd.GeoSeries
+        The line geometries to split
+
+    Returns
+    -------
+    segments : list
+        One (N, 2) array of x/y coordinates per individual line part
+    """
+    parts = shapely.get_parts(np.asarray(geometries))
+    coords, index = shapely.get_coordinates(parts, return_index=True)
+    if len(coords) == 0:
+        return []
+    return np.split(coords, np.flatnonzero(np.diff(index)) + 1)
+
+
+def _plot_lines(ax: plt.Axes, geometries: gpd.GeoSeries, **style):
+    """
+    Draw line geometries onto an axis as a single LineCollection artist
+
+    Parameters
+    ----------
+    ax : plt.Axes
+        The axis to draw on
+    geometries : gpd.GeoSeries
+        The line geometries to draw
+    **style
+        Keyword arguments passed to the LineCollection (color, linewidth, alpha, zorder, ...)
+
+    Returns
+    -------
+    collection : LineCollection
+        The artist added to the axis
+    """
+    collection = LineCollection(_line_segments(geometries), **style)
+    ax.add_collection(collection, autolim=True)
+    ax.autoscale_view()
+    return collection
+
+
+def _plot_polygons(ax: plt.Axes, geometries: gpd.GeoSeries, outline: dict, **style):
+    """
+    Draw (multi)polygons as a single PolyCollection with a separate outline, both
+    built from one extraction of the exterior ring coordinates
+
+    Parameters
+    ----------
+    ax : plt.Axes
+        The axes to draw on
+    geometries : gpd.GeoSeries
+        The polygon geometries to draw
+    outline : dict
+        Keyword arguments passed to the outline LineCollection (colors, linestyles, ...)
+    **style
+        Keyword arguments passed to the PolyCollection (facecolor, alpha, ...)
+
+    Returns
+    -------
+    collections : tuple
+        The PolyCollection of the polygons and the LineCollection of their outlines
+    """
+    parts = shapely.get_parts(np.asarray(geometries))
+    rings = _line_segments(shapely.get_exterior_ring(parts))
+    polygons = PolyCollection(rings, **style)
+    outlines = LineCollection(rings, **outline)
+    ax.add_collection(polygons, autolim=True)
+    ax.add_collection(outlines, autolim=False)
+    ax.autoscale_view()
+    # Match the aspect ratio geopandas would use for the coordinate system
+    if geometries.crs is not None and geometries.crs.is_geographic:
+        miny, maxy = geometries.total_bounds[[1, 3]]
+        ax.set_aspect(1 / np.cos(np.deg2rad((miny + maxy) / 2)))
+    else:
+        ax.set_aspect("equal")
+    return polygons, outlines
+
+
+def _add_basemap(ax: plt.Axes, crs):
+    """
+    Add the OpenStreetMap basemap to a map figure. Tiles are served from the
+    on-disk cache when available, and skipped entirely when offline.
+
+    Parameters
+    ----------
+    ax : plt.Axes
+        The axes to add the basemap to
+    crs : pyproj.CRS
+        The coordinate reference system of the axes
+    """
+    if CTX_OFFLINE:
+        return
+    try:
+        ctx.add_basemap(ax, crs=crs, source=ctx.providers.OpenStreetMap.Mapnik)
+    except Exception as e:
+        print(f"Failed retrieving the basemap tiles. {e}")
+
+
+def _downsample_factor(raster: xr.DataArray, figsize: tuple, dpi: float):
+    """
+    Determine the integer factor that reduces a raster to roughly the pixel
+    resolution of the figure it is drawn on
+
+    Parameters
+    ----------
+    raster : xr.DataArray
+        The raster with x and y dimensions
+    figsize : tuple
+        The (width, height) of the figure in inches
+    dpi : float
+        The resolution of the figure in dots per inch
+
+    Returns
+    -------
+    factor : int
+        The number of raster cells to aggregate along each axis (1 if no reduction is needed)
+    """
+    width_px, height_px = figsize[0] * dpi, figsize[1] * dpi
+    factor = min(raster.sizes["x"] / width_px, raster.sizes["y"] / height_px)
+    return max(1, int(factor))
+
+
 def plot_pilot_study_area(
     model_perimeter: gpd.GeoDataFrame,
     frequency_threshold: int,
@@ -150,12 +473,8 @@ def plot_pilot_study_area(
             The updated values for the keywords
     """
     # determine the center of the model perimeter
-    model_bbox = model_perimeter.bounds
-    center = (
-        model_bbox[["minx", "maxx"]].mean(axis=1).values[0],
-        model_bbox[["miny", "maxy"]].mean(axis=1).values[0],
-    )
-    point = Point(center)
+    minx, miny, maxx, maxy = model_perimeter.total_bounds
+    point = Point((minx + maxx) / 2, (miny + maxy) / 2)
 
     ### HUC4 Boundary
     # Create an instance of the WBD class for HUC8
@@ -171,20 +490,22 @@ def plot_pilot_study_area(
     # Query the NHDPlus HR network that covers the model perimeter
     geom_query = model_perimeter.union_all()
     network = nhd3d.bygeom(geom_query, model_perimeter.crs)
+    # Narrow the network to the flowlines intersecting the model perimeter using a spatial index
+    tree = shapely.STRtree(network.geometry.values)
+    hits = tree.query(geom_query, predicate="intersects")
+    network = network.iloc[np.sort(hits)]
     # Filter the network to only include the mainstem waterbody connectors
-    stream_names = network[network.featuretypelabel == "Waterbody Connector"][
-        "gnisidlabel"
-    ]
+    connectors = network[network.featuretypelabel == "Waterbody Connector"]
     # Determine the frequency of each stream name
-    stream_name_freq = stream_names.value_counts()
+    stream_name_freq = connectors.groupby("gnisidlabel")["gnisidlabel"].transform(
+        "size"
+    )
     # Drop streams with a frequency less than the threshold
-    stream_name_freq = stream_name_freq[stream_name_freq >= frequency_threshold]
-    streams_df = network[network.featuretypelabel == "Waterbody Connector"]
-    streams_df = streams_df[streams_df["gnisidlabel"].isin(stream_name_freq.index)]
+    streams_df = connectors[stream_name_freq >= frequency_threshold]
 
     ### Mainstem Reach
     # gcx = GeoConnex("mainstems")
-    # mainstem_reach_name = stream_name_freq.idxmax()
+    # mainstem_reach_name = connectors["gnisidlabel"].mode().iat[0]
     # Determine the mainstem reach ID from the streams_df. The ID is the last part of the mainstemid url
     # Ex: https://geoconnex.us/ref/mainstems/322043
     # mainstem_reach_id = (
@@ -195,24 +516,26 @@ def plot_pilot_study_area(
     # mainstem_reach = gcx.byid("id", int(mainstem_reach_id))
 
     ### Generate the figure
-    fig, ax = plt.subplots(figsize=(10, 10))
+    fig, ax = plt.subplots(figsize=(10, 10), constrained_layout=True)
     # Add the model perimeter, HUC4 boundary, streams, and mainstem reach to the plot
-    model_perimeter.plot(
-        ax=ax, facecolor="red", edgecolor="black", alpha=0.2, linewidth=1
-    )
-    model_perimeter.plot(
-        ax=ax, facecolor="none", edgecolor="black", alpha=1, linewidth=1, linestyle="--"
+    _plot_polygons(
+        ax,
+        model_perimeter.geometry,
+        outline=dict(colors="black", linewidths=1, linestyles="--"),
+        facecolor="red",
+        edgecolor="black",
+        alpha=0.2,
+        linewidth=1,
     )
-    huc4_boundary.plot(ax=ax, facecolor="none", edgecolor="black", linewidth=3)
-    streams_df.plot(ax=ax, color="blue", linewidth=1, alpha=0.5)
+    _plot_lines(ax, huc4_boundary.boundary, color="black", linewidth=3)
+    _plot_lines(ax, streams_df.geometry, color="blue", linewidth=1, alpha=0.5)
 
-    # mainstem_reach.plot(ax=ax, color="blue", linewidth=2, label=mainstem_reach_name)
+    # _plot_lines(ax, mainstem_reach.geometry, color="blue", linewidth=2, label=mainstem_reach_name)
 
     # Add lat/lon labels
     ax.set_xlabel("Longitude")
     ax.set_ylabel("Latitude")
     # Remove empty space around the plot
-    plt.tight_layout()
     plt.margins(0)
     # Create custom legend handles
     custom_handles = [
@@ -233,22 +556,19 @@ def plot_pilot_study_area(
     legend_ax.legend(custom_handles, labels, loc="center", framealpha=1, ncols=3)
 
     # Add a basemap
-    ctx.add_basemap(
-        ax=ax, crs=model_perimeter.crs, source=ctx.providers.OpenStreetMap.Mapnik
-    )
+    _add_basemap(ax, model_perimeter.crs)
 
     # Save the figure
     image_path = os.path.join(root_dir, f"{domain_name}_figure_pilot_study_area.png")
-    fig.savefig(image_path, bbox_inches="tight")
+    image = _save_figure(fig, image_path, in_memory=report_document is not None)
     plt.close(fig)
     if report_document is None and report_keywords is None:
         return image_path
     else:
         # Search for the figure keyword within the document and add the image above it
         report_document = add_image_to_keyword(
-            report_document, "«figure_pilot_study_area»", image_path
+            report_document, "«figure_pilot_study_area»", image
         )
-        os.remove(image_path)
         # Update the report text
         basin_name, pilot_name = (
             huc8_boundary.name.values[0],
@@ -300,7 +620,7 @@ def plot_dem(
     # Get the DEM data within the model perimeter
     dem = get_dem_data(model_perimeter)
     # Generate the figure
-    fig, ax = plt.subplots(figsize=(10, 10), dpi=300)
+    fig, ax = plt.subplots(figsize=(10, 10), dpi=150, constrained_layout=True)
     if dem is None:
         # Plot the model perimeter
         model_perimeter.plot(ax=ax, edgecolor="black", linewidth=3, facecolor="none")
@@ -310,24 +630,19 @@ def plot_dem(
         ax.set_ylabel("Latitude")
         # remove the title
         ax.set_title("")
-        # Remove empty space around the plot
-        plt.tight_layout()
         # Add a basemap
-        ctx.add_basemap(
-            ax, crs=model_perimeter.crs, source=ctx.providers.OpenStreetMap.Mapnik
-        )
+        _add_basemap(ax, model_perimeter.crs)
         # Save the figure
         image_path = os.path.join(root_dir, f"{domain_name}_figure_dem.png")
-        fig.savefig(image_path, bbox_inches="tight")
+        image = _save_figure(fig, image_path, in_memory=report_document is not None)
         plt.close(fig)
         if report_document is None and report_keywords is None:
             return image_path
         else:
             # Search for the keyword within the document and add the image above it
             report_document = add_image_to_keyword(
-                report_document, "«figure_dem»", image_path
+                report_document, "«figure_dem»", image
             )
-            os.remove(image_path)
             # Update the report text
             basin_name = report_keywords["Model_Unit_Name"]
             report_keywords[
@@ -335,18 +650,21 @@ def plot_dem(
             ] = f"{basin_name} Digital Elevation Model (DEM)"
             return report_document, report_keywords
     else:
+        # Downsample the DEM to roughly the pixel resolution of the figure
+        factor = _downsample_factor(dem, fig.get_size_inches(), fig.dpi)
+        if factor > 1:
+            dem = dem.coarsen(x=factor, y=factor, boundary="trim").mean()
         # Convert units from m to ft
         dem = dem * 3.28084
-        # Plot the DEM
-        cax = dem.plot(ax=ax, cmap="terrain", add_colorbar=False)
+        # Plot the DEM as a single image rather than a mesh of cells
+        cax = dem.plot.imshow(ax=ax, cmap="terrain", add_colorbar=False)
+        cax.set_rasterized(True)
         model_perimeter.plot(ax=ax, edgecolor="black", linewidth=3, facecolor="none")
         # set an x and y axis labels
         ax.set_xlabel("Longitude")
         ax.set_ylabel("Latitude")
         # remove the title
         ax.set_title("")
-        # Remove empty space around the plot
-        plt.tight_layout()
         # Create a divider for the existing axes instance
         divider = make_axes_locatable(ax)
         # Append axes to the bottom of ax, with 5% width of ax
@@ -357,16 +675,15 @@ def plot_dem(
         cbar.set_label("Elevation (ft)")
         # Save the figure
         image_path = os.path.join(root_dir, f"{domain_name}_figure_dem.png")
-        fig.savefig(image_path, bbox_inches="tight")
+        image = _save_figure(fig, image_path, in_memory=report_document is not None)
         plt.close(fig)
         if report_document is None and report_keywords is None:
             return image_path
         else:
             # Search for the keyword within the document and add the image above it
             report_document = add_image_to_keyword(
-                report_document, "«figure_dem»", image_path
+                report_document, "«figure_dem»", image
             )
-            os.remove(image_path)
             # Update the report text
             basin_name = report_keywords["Model_Unit_Name"]
             report_keywords[
@@ -424,7 +741,7 @@ def plot_stream_network(
             The updated values for the keywords
     """
     # Generate the figure
-    fig, ax = plt.subplots(figsize=(10, 10))
+    fig, ax = plt.subplots(figsize=(10, 10), constrained_layout=True)
     model_perimeter.boundary.plot(ax=ax, color="black", linewidth=3, zorder=4)
     # Query all NHD streams within the domain
     streams = get_nhd_flowlines(model_perimeter)
@@ -436,7 +753,10 @@ def plot_stream_network(
             print(f"Error retrieving NHD streams. {streams}")
     else:
         print("Successfully retrieved NHD streams")
-        streams.plot(ax=ax, color="blue", linewidth=1, zorder=1)
+        stream_lines = _plot_lines(
+            ax, streams.geometry, color="blue", linewidth=1, zorder=1
+        )
+        stream_lines.set_rasterized(True)
         num_streams = len(streams["gnis_name"].unique())
 
     # Query all NID dams within the domain
@@ -463,7 +783,6 @@ def plot_stream_network(
     ax.set_xlabel("Longitude")
     ax.set_ylabel("Latitude")
     # Remove empty space around the plot
-    plt.tight_layout()
     plt.margins(0)
 
     # Create custom legend handles
@@ -488,21 +807,18 @@ def plot_stream_network(
     legend_ax.axis("off")
     legend_ax.legend(custom_handles, labels, loc="center", framealpha=1, ncols=2)
     # Add a basemap
-    ctx.add_basemap(
-        ax, crs=model_perimeter.crs, source=ctx.providers.OpenStreetMap.Mapnik
-    )
+    _add_basemap(ax, model_perimeter.crs)
     # Save the figure
     image_path = os.path.join(root_dir, f"{domain_name}_figure_basin_datasets.png")
-    fig.savefig(image_path, bbox_inches="tight")
+    image = _save_figure(fig, image_path, in_memory=report_document is not None)
     plt.close(fig)
     if report_document is None and report_keywords is None:
         return image_path
     else:
         # Search for the keyword within the document and add the image above it
         report_document = add_image_to_keyword(
-            report_document, "«figure_basin_datasets»", image_path
+            report_document, "«figure_basin_datasets»", image
         )
-        os.remove(image_path)
         # Update the report text
         report_keywords[
             "figure_basin_datasets"
@@ -545,36 +861,40 @@ def plot_gage_por(
         # Create an instance of the NWIS class
         nwis = NWIS()
         generated_image_paths = []
+        # Get all available daily streamflow data for each station. Every station
+        # has its own period of record, so the requests are sent concurrently
+        with ThreadPoolExecutor(max_workers=_NWIS_MAX_WORKERS) as executor:
+            qpor_dfs_daily = list(
+                executor.map(
+                    partial(nwis.get_streamflow, mmd=False, freq="dv"),
+                    [[station_id] for station_id in df_gages_usgs["site_no"]],
+                    zip(df_gages_usgs["begin_date"], df_gages_usgs["end_date"]),
+                )
+            )
+        # Create a single figure and clear it between stations
+        fig = plt.figure(figsize=(15, 10), constrained_layout=True)
         # Loop through each station
-        for idx, row in df_gages_usgs.iterrows():
-            station_id = row["site_no"]  # 08059590
+        for station_id, station_name, qpor_df_daily in zip(
+            df_gages_usgs["site_no"],  # 08059590
+            df_gages_usgs["station_nm"],  # Willow Creek at Highway 80
+            qpor_dfs_daily,
+        ):
             station = f"USGS-{station_id}"  # USGS-08059590
-            station_name = row["station_nm"]  # Willow Creek at Highway 80
             print(f"Processing station {station} {station_name}")
-            begin_date = row["begin_date"]
-            end_date = row["end_date"]
-            dates = (begin_date, end_date)
-            # Get all available streamflow data within the specified date range
-            qpor_df_daily = nwis.get_streamflow(
-                [station_id], dates, mmd=False, freq="dv"
-            )
-            qpor_df_daily = qpor_df_daily * 35.3147  # Convert from cms to cfs
+            q_dates = qpor_df_daily.index
+            q = qpor_df_daily.to_numpy(dtype=float)[:, 0] * 35.3147  # cms to cfs
 
             # Calculate the monthly and annual peak streamflow data
-            qpor_df_monthly = qpor_df_daily.copy()
-            qpor_df_monthly = qpor_df_monthly.groupby(
-                qpor_df_monthly.index.month
-            ).mean()
-            qpor_df_annual = qpor_df_daily.copy()
-            qpor_df_annual = qpor_df_annual.groupby(qpor_df_annual.index.year).max()
+            qpor_df_monthly = _monthly_mean(q_dates, q)
+            qpor_df_annual = _annual_max(q_dates, q)
 
             # Calculate the Annual Exceedance Probability for the annual peak streamflow data
             aep_df = calc_aep(qpor_df_annual)
 
-            # Generate the figure
-            fig = plt.figure(figsize=(15, 10))
+            # Reset the figure
+            fig.clf()
             # Define a GridSpec with 2 rows and 3 columns
-            gs = gridspec.GridSpec(2, 3, height_ratios=[1, 1])
+            gs = gridspec.GridSpec(2, 3, figure=fig, height_ratios=[1, 1])
             # Create subplots using the GridSpec layout
             ax1 = fig.add_subplot(gs[0, :])  # Top row, spans all columns
             ax2 = fig.add_subplot(
@@ -584,8 +904,8 @@ def plot_gage_por(
 
             # Plot the daily streamflow data
             ax1.plot(
-                qpor_df_daily.index,
-                qpor_df_daily.values,
+                q_dates,
+                q,
                 label="Daily Streamflow",
                 color="blue",
                 alpha=0.7,
@@ -661,23 +981,20 @@ def plot_gage_por(
 
             # Add a title to the figure
             fig.suptitle(f"{station} {station_name}", fontsize=24)
-            # Display the plot
-            plt.tight_layout()
 
             # Save the figure
             image_path = os.path.join(
                 root_dir, f"{domain_name}_figure_stream_gage_summary_{station}.png"
             )
-            fig.savefig(image_path, bbox_inches="tight")
-            plt.close(fig)
+            image = _save_figure(fig, image_path, in_memory=report_document is not None)
             if report_document is None and report_keywords is None:
                 generated_image_paths.append(image_path)
             else:
                 # Search for the keyword within the document and add the image above it
                 report_document = add_image_to_keyword(
-                    report_document, "«figure_stream_gage_summary»", image_path
+                    report_document, "«figure_stream_gage_summary»", image
                 )
-                os.remove(image_path)
+        plt.close(fig)
 
         if report_document is None and report_keywords is None:
             return generated_image_paths
@@ -733,53 +1050,6 @@ def plot_nlcd(
         report_keywords : dict
             The updated values for the keywords
     """
-    # Create a dictionary of the land cover metadata
-    meta = {
-        11: "Open Water",
-        12: "Perennial Ice/Snow",
-        21: "Developed, Open Space",
-        22: "Developed, Low Intensity",
-        23: "Developed, Medium Intensity",
-        24: "Developed, High Intensity",
-        31: "Barren Land (Rock/Sand/Clay)",
-        41: "Deciduous Forest",
-        42: "Evergreen Forest",
-        43: "Mixed Forest",
-        51: "Dwarf Scrub",
-        52: "Shrub/Scrub",
-        71: "Grassland/Herbaceous",
-        72: "Sedge/Herbaceous",
-        73: "Lichens",
-        74: "Moss",
-        81: "Pasture/Hay",
-        82: "Cultivated Crops",
-        90: "Woody Wetlands",
-        95: "Emergent Herbaceous Wetlands",
-    }
-    # Define the color pallet for the NLCD classes
-    colors = {
-        11: "#486DA2",  # Open Water
-        12: "#E7EFFC",  # Perennial Ice/Snow
-        21: "#E1CDCE",  # Developed, Open Space
-        22: "#DC9881",  # Developed, Low Intensity
-        23: "#F10100",  # Developed, Medium Intensity
-        24: "#AB0101",  # Developed, High Intensity
-        31: "#B3AFA4",  # Barren Land (Rock/Sand/Clay)
-        41: "#6CA966",  # Deciduous Forest
-        42: "#1D6533",  # Evergreen Forest
-        43: "#BDCC93",  # Mixed Forest
-        51: "#B49E48",  # Dwarf Scrub
-        52: "#D1BB82",  # Shrub/Scrub
-        71: "#EDECCD",  # Grassland/Herbaceous
-        72: "#D0D181",  # Sedge/Herbaceous
-        73: "#A4CC51",  # Lichens
-        74: "#82BA9D",  # Moss
-        81: "#DDD83E",  # Pasture/Hay
-        82: "#AE7229",  # Cultivated Crops
-        90: "#BBD7ED",  # Woody Wetlands
-        95: "#71A4C1",  # Emergent Herbaceous Wetlands
-    }
-
     # Load the file into an xarray Dataset object
     nlcd = rxr.open_rasterio(nlcd_file_path)
     nlcd = xr.Dataset({"data": nlcd})
@@ -794,14 +1064,14 @@ def plot_nlcd(
     # Filter the colors and classes to only what is present within the provided dataset
     unique_nlcd = np.unique(nlcd.data.values)
     # seperate all unique values that do not belong to the NLCD classes
-    non_nlcd = [value for value in unique_nlcd if value not in meta.keys()]
+    non_nlcd = [value for value in unique_nlcd if value not in _NLCD_CLASS_NAMES]
     # remove the non-NLCD values from the unique NLCD values
     unique_nlcd = [value for value in unique_nlcd if value not in non_nlcd]
     if len(unique_nlcd) == 0:
         raise ValueError("Provided NLCD raster does not contain any NLCD classes")
 
-    colors = [colors[key] for key in unique_nlcd]
-    nlcd_classes = pd.Series(meta)
+    colors = [_NLCD_COLORS[key] for key in unique_nlcd]
+    nlcd_classes = pd.Series(_NLCD_CLASS_NAMES)
     nlcd_classes = nlcd_classes.loc[unique_nlcd]
 
     # mask non-NLCD values from the dataset
@@ -812,11 +1082,25 @@ def plot_nlcd(
     norm = BoundaryNorm(list(nlcd_classes.keys()) + [100], cmap.N)
     levels = nlcd_classes.index
 
-    fig, ax = plt.subplots(figsize=(10, 8), dpi=300)
+    fig, ax = plt.subplots(figsize=(10, 8), dpi=150)
+    # Decimate the land cover to roughly the pixel resolution of the figure.
+    # Nearest-neighbor sampling keeps the class codes intact.
+    factor = _downsample_factor(nlcd, fig.get_size_inches(), fig.dpi)
+    if factor > 1:
+        nlcd = nlcd.isel(x=slice(None, None, factor), y=slice(None, None, factor))
     model_perimeter.plot(
         ax=ax, edgecolor="black", facecolor="none", linewidth=3, zorder=1
     )
-    nlcd.data.plot(ax=ax, add_colorbar=False, cmap=cmap, norm=norm, zorder=0)
+    # Plot the land cover as a single image, sampling the nearest class code per pixel
+    cover = nlcd.data.squeeze("band", drop=True).plot.imshow(
+        ax=ax,
+        add_colorbar=False,
+        cmap=cmap,
+        norm=norm,
+        interpolation="nearest",
+        zorder=0,
+    )
+    cover.set_rasterized(True)
     # Create custom legend handles with edge color
     legend_handles = [
         mpatches.Patch(
@@ -842,16 +1126,13 @@ def plot_nlcd(
 
     # Save the figure
     image_path = os.path.join(root_dir, f"{domain_name}_figure_nlcd.png")
-    fig.savefig(image_path, bbox_inches="tight")
+    image = _save_figure(fig, image_path, in_memory=report_document is not None)
     plt.close(fig)
     if report_document is None and report_keywords is None:
         return image_path
     else:
         # Search for the keyword within the document and add the image above it
-        report_document = add_image_to_keyword(
-            report_document, "«figure_nlcd»", image_path
-        )
-        os.remove(image_path)
+        report_document = add_image_to_keyword(report_document, "«figure_nlcd»", image)
         # Update the report text
         report_keywords["figure_nlcd"] = f"NLCD Land Cover Usage"
         return report_document, report_keywords
@@ -894,21 +1175,20 @@ def plot_soil_porosity(
     por = geoutils.xarray_geomask(
         por, model_perimeter.geometry.iloc[0], model_perimeter.crs
     )
-    por = por.where(por.porosity > por.porosity.rio.nodata)
-    por["por"] = por.porosity.rio.write_nodata(np.nan)
+    # mask the nodata values in a single pass over the porosity array
+    porosity = por.porosity
+    por = porosity.where(porosity > porosity.rio.nodata).rio.write_nodata(np.nan)
 
     # Generate the figure
-    fig, ax = plt.subplots(figsize=(10, 10), dpi=300)
+    fig, ax = plt.subplots(figsize=(10, 10), dpi=150, constrained_layout=True)
     # Plot the
-    cax = por.por.plot(ax=ax, cmap="gist_earth_r", add_colorbar=False)
+    cax = por.plot(ax=ax, cmap="gist_earth_r", add_colorbar=False, rasterized=True)
     model_perimeter.plot(ax=ax, edgecolor="black", linewidth=3, facecolor="none")
     # set an x and y axis labels
     ax.set_xlabel("Longitude")
     ax.set_ylabel("Latitude")
     # remove the title
     ax.set_title("")
-    # Remove empty space around the plot
-    plt.tight_layout()
     # Create a divider for the existing axes instance
     divider = make_axes_locatable(ax)
     # Append axes to the right of ax, with 5% width of ax
@@ -918,18 +1198,13 @@ def plot_soil_porosity(
     # Set the colorbar label
     cbar.set_label("Soil Porosity (mm/m)")
     # Add a basemap
-    ctx.add_basemap(
-        ax, crs=model_perimeter.crs, source=ctx.providers.OpenStreetMap.Mapnik
-    )
+    _add_basemap(ax, model_perimeter.crs)
     # Save the figure
     image_path = os.path.join(root_dir, f"{domain_name}_figure_soils.png")
-    fig.savefig(image_path, bbox_inches="tight")
+    image = _save_figure(fig, image_path, in_memory=True)
     plt.close(fig)
     # Search for the keyword within the document and add the image above it
-    report_document = add_image_to_keyword(
-        report_document, "«figure_soils»", image_path
-    )
-    os.remove(image_path)
+    report_document = add_image_to_keyword(report_document, "«figure_soils»", image)
     # Update the report text
     report_keywords[
         "figure_soils"
@@ -981,12 +1256,32 @@ def plot_model_mesh(
     num_cells = len(model_cells)
     num_breaklines = len(model_breaklines)
     # create a plot of the model geometry
-    fig, ax = plt.subplots(figsize=(10, 10), dpi=300)
+    fig, ax = plt.subplots(figsize=(10, 10), dpi=150)
     model_perimeter.plot(ax=ax, facecolor="none", edgecolor="black", linewidth=3)
-    if num_cells > 0:
-        model_cells.plot(ax=ax, facecolor="none", edgecolor="blue", linewidth=0.25)
+    if num_cells > _MAX_MESH_CELLS:
+        # Too many cells to distinguish at the figure resolution, shade the domain instead
+        model_perimeter.plot(ax=ax, facecolor="blue", edgecolor="none", alpha=0.3)
+    elif num_cells > 0:
+        # Draw all of the cells as a single artist rather than one patch per cell
+        parts = shapely.get_parts(np.asarray(model_cells.geometry))
+        cells = PolyCollection(
+            _line_segments(shapely.get_exterior_ring(parts)),
+            facecolor="none",
+            edgecolor="blue",
+            linewidth=0.25,
+            rasterized=True,
+        )
+        ax.add_collection(cells, autolim=True)
+        ax.autoscale_view()
     if num_breaklines > 0:
-        model_breaklines.plot(ax=ax, color="red", linewidth=1, alpha=0.5)
+        _plot_lines(
+            ax,
+            model_breaklines.geometry,
+            color="red",
+            linewidth=1,
+            alpha=0.5,
+            rasterized=True,
+        )
 
     # Create custom legend handles
     custom_handles = [
@@ -1009,23 +1304,20 @@ def plot_model_mesh(
     legend_ax.legend(custom_handles, labels, loc="center", framealpha=1, ncols=3)
 
     # Add a basemap
-    ctx.add_basemap(
-        ax, crs=model_perimeter.crs, source=ctx.providers.OpenStreetMap.Mapnik
-    )
+    _add_basemap(ax, model_perimeter.crs)
     ax.set_xlabel("Longitude")
     ax.set_ylabel("Latitude")
     # Save the figure
     image_path = os.path.join(root_dir, f"{domain_name}_figure_model_mesh.png")
-    fig.savefig(image_path, bbox_inches="tight")
+    image = _save_figure(fig, image_path, in_memory=report_document is not None)
     plt.close(fig)
     if report_document is None and report_keywords is None:
         return image_path
     else:
         # Search for the keyword within the document and add the image above it
         report_document = add_image_to_keyword(
-            report_document, "«figure_model_mesh»", image_path
+            report_document, "«figure_model_mesh»", image
         )
-        os.remove(image_path)
         # Update the report text
         report_keywords[
             "figure_model_mesh"
@@ -1033,88 +1325,56 @@ def plot_model_mesh(
         return report_document, report_keywords
 
 
-def calc_wse_stats(df: pd.DataFrame, target_column: str):
-    """ "
-    Calculate the frequency, PDF, and CDF of a target column in a dataframe
-
-    Parameters
-    ----------
-    df : pd.DataFrame
-        A pandas dataframe with the target column
-    target_column : str
-        The name of the target column in the dataframe
-
-    Returns
-    -------
-    stats_df : pd.DataFrame
-        A pandas dataframe with the frequency, PDF, and CDF of the target column
-    """
-    # filter out values of -9999 and zeros
-    df = df[df[target_column] != -9999]
-    df = df[df[target_column] > 0]
-    # Frequency
-    stats_df = (
-        df.groupby(target_column)[target_column]
-        .agg("count")
-        .pipe(pd.DataFrame)
-        .rename(columns={target_column: "frequency"})
-    )
-    # PDF
-    stats_df["pdf"] = stats_df["frequency"] / sum(stats_df["frequency"])
-    # CDF
-    stats_df["cdf"] = stats_df["pdf"].cumsum() * 100
-    stats_df = stats_df.reset_index()
-    return stats_df
-
-
 def plot_hist_cdf(
-    stats_df: pd.DataFrame,
+    values: np.ndarray,
     target_column: str,
     plot_title: str,
     threshold: float,
     num_bins: int,
-    output_path: str,
+    output_path: Union[str, io.BytesIO],
 ):
     """
-    Plot a histogram and CDF of a target column in a dataframe
+    Plot a histogram and CDF of the values of a target column
 
     Parameters
     ----------
-    stats_df : pd.DataFrame
-        A pandas dataframe with the frequency, PDF, and CDF of the target column
+    values : np.ndarray
+        The values of the target column for each cell, excluding nodata and zeros
     target_column : str
-        The name of the target column in the dataframe
+        The name of the target column
     plot_title : str
         The title of the plot
     threshold : float
         The threshold for the histogram's x-axis
     num_bins : int
         The number of bins for the histogram
-    output_path : str
-        The path to save the plot
+    output_path : str or io.BytesIO
+        The path or in-memory stream to save the plot to
+
+    Returns
+    -------
+    bool
+        True if the plot was saved, False if no values fall within the threshold
     """
+    # Bin the values between zero and the threshold
+    counts, edges = np.histogram(values, bins=num_bins, range=(0, threshold))
+    if counts.sum() == 0:
+        print(f"No {plot_title} values to plot below the threshold of {threshold}")
+        return False
 
-    fig, ax = plt.subplots(2, 1, sharex=True, figsize=(10, 10))
+    fig, ax = plt.subplots(2, 1, sharex=True, figsize=(10, 10), constrained_layout=True)
     ax = ax.flatten()
-    # plot the histogram
-    target_values = stats_df[target_column].values
-    filtered_values = target_values[(target_values <= threshold) & (target_values >= 0)]
-    weights = np.ones_like(filtered_values) / float(len(filtered_values)) * 100
-    n, bins, patches = ax[0].hist(
-        filtered_values,
-        bins=num_bins,
-        weights=weights,
-        range=(0, threshold),
-        density=False,
-    )
+    # plot the histogram as the percentage of cells within each uniform bin
+    percent = counts * (100.0 / counts.sum())
+    ax[0].bar(edges[:-1], percent, width=np.diff(edges), align="edge")
     # determine the percentage of cells that have errors greater than the threshold
     if target_column == "ttp_hrs":
         # cells with time to peak occuring within the last hour of the simulation
-        exceedance = int(len(target_values[target_values >= threshold]))
+        exceedance = int(np.count_nonzero(values >= threshold))
         plot_units = "hours"
     else:
         # cells with WSE errors greater than the threshold
-        exceedance = int(len(target_values[(target_values > threshold)]))
+        exceedance = int(np.count_nonzero(values > threshold))
         plot_units = "ft"
 
     ax[0].set(
@@ -1134,18 +1394,10 @@ def plot_hist_cdf(
             [f"{plot_title} > {threshold:.1f}: {exceedance} Cells"], loc="upper right"
         )
 
-    # plot the CDF
-    cdf_df = stats_df[
-        (stats_df[target_column] <= threshold) & (stats_df[target_column] >= 0)
-    ]
-    # Resample the data to num_bins equally spaced points
-    x = np.linspace(cdf_df[target_column].min(), cdf_df[target_column].max(), num_bins)
-    y = np.interp(
-        x, cdf_df[target_column].sort_values(), np.linspace(0, 100, len(cdf_df))
-    )
-    cdf_df = pd.DataFrame({target_column: x, "cdf": y})
+    # plot the CDF at the bin edges from the cumulative bin counts
+    cdf = np.concatenate(([0.0], np.cumsum(counts))) / counts.sum() * 100
 
-    ax[1].plot(cdf_df[target_column], cdf_df["cdf"], linewidth=3)
+    ax[1].plot(edges, cdf, linewidth=3)
     ax[1].set(
         xlabel=f"{plot_title} ({plot_units})",
         ylabel="P(X <= x) (%)",
@@ -1162,11 +1414,10 @@ def plot_hist_cdf(
         ax[1].xaxis.set_major_formatter(
             plt.FuncFormatter(lambda x, _: "{:.2f}".format(x))
         )
-    # add space between both subplots
-    plt.tight_layout()
     # save the plot
-    plt.savefig(output_path)
+    plt.savefig(output_path, pil_kwargs=_PNG_KWARGS)
     plt.close(fig)
+    return True
 
 
 def plot_wse_errors(
@@ -1211,10 +1462,16 @@ def plot_wse_errors(
             The updated values for the keywords
     """
     # Get the mesh cell points and domain name
-    cell_points = get_plan_cell_points(hdf_plan_file_path)
+    cell_points = get_plan_cell_points(
+        hdf_plan_file_path, columns=["mesh_name", "max_ws_err"]
+    )
     domain_name = cell_points["mesh_name"].unique()[0]
     # Generate the Figure for the WSE Error QC
     image_path = os.path.join(root_dir, f"{domain_name}_figure_wse_errors.png")
+    # Filter the max WSE errors to the cells with errors in a single pass, as float32
+    # since the statistics need far less precision than float64
+    wse_errors = cell_points["max_ws_err"].to_numpy(dtype=np.float32)
+    wse_errors = wse_errors[(wse_errors != -9999) & (wse_errors > 0)]
 
     # Process Max WSE Errors and export graphics
     if len(cell_points) == 0:
@@ -1227,7 +1484,7 @@ def plot_wse_errors(
                 f"plan0{plan_index}_figure_wse_errors"
             ] = "No cells found in the HDF file"
             return report_document, report_keywords
-    elif len(cell_points[cell_points["max_ws_err"] > 0]) == 0:
+    elif len(wse_errors) == 0:
         print("No cells with WSE errors greater than zero")
         output_message = "No cells with WSE errors greater than zero"
         if report_document is None and report_keywords is None and plan_index is None:
@@ -1238,31 +1495,42 @@ def plot_wse_errors(
             ] = "No cells with WSE errors greater than zero"
             return report_document, report_keywords
     else:
-        # Calculate the frequency, PDF, and CDF of the max WSE errors
-        cell_stats_df = calc_wse_stats(cell_points, "max_ws_err")
         num_cells = len(cell_points)
-        cells_exceeding_threshold = cell_points[
-            cell_points["max_ws_err"] > wse_error_threshold
-        ]
-        num_cells_exceeding_threshold = len(cells_exceeding_threshold)
-        max_wse_error = cell_points["max_ws_err"].max()
-        # Plot the histogram and CDF of the max WSE errors
-        plot_hist_cdf(
-            cell_stats_df,
+        num_cells_exceeding_threshold = int(
+            np.count_nonzero(wse_errors > wse_error_threshold)
+        )
+        max_wse_error = wse_errors.max()
+        # Plot the histogram and CDF of the max WSE errors, in memory for the report
+        image = image_path if report_document is None else io.BytesIO()
+        plotted = plot_hist_cdf(
+            wse_errors,
             "max_ws_err",
             "Max WSE Error",
             wse_error_threshold,
             num_bins,
-            image_path,
+            image,
         )
+        if not plotted:
+            output_message = (
+                f"All {len(wse_errors):,} cells with WSE errors exceed the threshold "
+                f"of {wse_error_threshold:.2f}-feet"
+            )
+            if (
+                report_document is None
+                and report_keywords is None
+                and plan_index is None
+            ):
+                return output_message
+            else:
+                report_keywords[f"plan0{plan_index}_figure_wse_errors"] = output_message
+                return report_document, report_keywords
         if report_document is None and report_keywords is None and plan_index is None:
             return image_path
         else:
             # Search for the keyword within the document and add the image above it
             report_document = add_image_to_keyword(
-                report_document, f"«plan0{plan_index}_figure_wse_errors»", image_path
+                report_document, f"«plan0{plan_index}_figure_wse_errors»", image
             )
-            os.remove(image_path)
             # Update the report text
             report_keywords[
                 f"plan0{plan_index}_figure_wse_errors"
@@ -1310,7 +1578,9 @@ def plot_wse_ttp(
             The updated values for the keywords
     """
     # Get the mesh cell points and domain name
-    cell_points = get_plan_cell_points(hdf_plan_file_path)
+    cell_points = get_plan_cell_points(
+        hdf_plan_file_path, columns=["mesh_name", "min_ws_time", "max_ws_time"]
+    )
     domain_name = cell_points["mesh_name"].unique()[0]
     # Generate the Figure for the WSE Error QC
     image_path = os.path.join(root_dir, f"{domain_name}_figure_wse_ttp.png")
@@ -1327,16 +1597,14 @@ def plot_wse_ttp(
             ] = "No cells found in the HDF file"
             return report_document, report_keywords
 
-    # Determine the global min time to peak for the simulation start time
-    start_time = cell_points["min_ws_time"].min()
-    # find the time to peak between the max and min water surface elevation times
-    ttp = cell_points["max_ws_time"] - start_time
-    # convert to hours
-    ttp = ttp.dt.total_seconds() / 3600
-    ttp = ttp.to_frame()
-    ttp.columns = ["ttp_hrs"]
+    # Find the time to peak (hours) of each cell
+    ttp_hrs = calc_time_to_peak(cell_points).astype(np.float32)
+    num_cells = len(cell_points)
+    cell_points = None
+    # Filter the time to peak to the cells with a positive time to peak
+    ttp_hrs = ttp_hrs[ttp_hrs > 0]
 
-    if len(ttp[ttp["ttp_hrs"] > 0]) == 0:
+    if len(ttp_hrs) == 0:
         print("No cells with time to peak greater than zero")
         output_message = "No cells with time to peak greater than zero"
         if report_document is None and report_keywords is None and plan_index is None:
@@ -1348,30 +1616,25 @@ def plot_wse_ttp(
             return report_document, report_keywords
     else:
         # Define the global max time to peak
-        ttp_max = ttp["ttp_hrs"].max()
-        num_cells = len(cell_points)
-        cell_points = None
-        # Calculate the frequency, PDF, and CDF of the time to peak
-        cell_stats_df = calc_wse_stats(ttp, "ttp_hrs")
-        cells_exceeding_threshold = cell_stats_df[cell_stats_df["ttp_hrs"] >= ttp_max]
-        num_cells_exceeding_threshold = len(cells_exceeding_threshold)
-        # Plot the histogram and CDF of the time to peak
+        ttp_max = ttp_hrs.max()
+        num_cells_exceeding_threshold = int(np.count_nonzero(ttp_hrs >= ttp_max))
+        # Plot the histogram and CDF of the time to peak, in memory for the report
+        image = image_path if report_document is None else io.BytesIO()
         plot_hist_cdf(
-            cell_stats_df,
+            ttp_hrs,
             "ttp_hrs",
             "Time to Peak",
             ttp_max,
             num_bins,
-            image_path,
+            image,
         )
         if report_document is None and report_keywords is None and plan_index is None:
             return image_path
         else:
             # Search for the keyword within the document and add the image above it
             report_document = add_image_to_keyword(
-                report_document, f"«plan0{plan_index}_figure_wse_ttp»", image_path
+                report_document, f"«plan0{plan_index}_figure_wse_ttp»", image
             )
-            os.remove(image_path)
             # Update the report text
             report_keywords[
                 f"plan0{plan_index}_figure_wse_ttp"
@@ -1407,7 +1670,11 @@ def find_timstep_freq(df: pd.DataFrame):
         return ts_freq
 
 
-def format_datetime(qobs_df: pd.DataFrame, qsim_df: pd.DataFrame):
+def format_datetime(
+    qobs_df: pd.DataFrame,
+    qsim_df: pd.DataFrame,
+    qsim_freq: Optional[pd.Timedelta] = None,
+):
     """
     Format the datetime index of the observed and modeled datasets
     and resample the data to the same timestep frequency.
@@ -1418,6 +1685,8 @@ def format_datetime(qobs_df: pd.DataFrame, qsim_df: pd.DataFrame):
         The observed data DataFrame
     qsim_df : pd.DataFrame
         The modeled data DataFrame
+    qsim_freq : pd.Timedelta, optional
+        The timestep frequency of the modeled data, if already known
 
     Returns
     -------
@@ -1430,7 +1699,8 @@ def format_datetime(qobs_df: pd.DataFrame, qsim_df: pd.DataFrame):
     """
     # Determine the frequency of the data
     qobs_freq = find_timstep_freq(qobs_df)
-    qsim_freq = find_timstep_freq(qsim_df)
+    if qsim_freq is None:
+        qsim_freq = find_timstep_freq(qsim_df)
 
     # Resample the data to the same timestep frequency of the model
     if qobs_freq < qsim_freq:
@@ -1502,6 +1772,181 @@ def format_datetime(qobs_df: pd.DataFrame, qsim_df: pd.DataFrame):
     
 
 
+def _match_gages(
+    ref_lines: gpd.GeoDataFrame, df_gages_usgs: gpd.GeoDataFrame, max_distance: float
+):
+    """
+    Match every reference line to its closest gage in a single spatial index pass
+
+    Parameters
+    ----------
+    ref_lines : gpd.GeoDataFrame
+        The reference lines of the model, with a 'refln_id' column
+    df_gages_usgs : gpd.GeoDataFrame
+        The USGS gages, with a default RangeIndex
+    max_distance : float
+        The search distance around each reference line, in the units of the CRS
+
+    Returns
+    -------
+    gage_matches : gpd.GeoDataFrame
+        The reference lines joined to their closest gage. The gage columns and
+        'index_right' are NaN for lines without a gage within the search distance,
+        and a line is repeated for each of several equally close gages.
+    """
+    return gpd.sjoin_nearest(
+        ref_lines[["refln_id", "geometry"]],
+        df_gages_usgs,
+        how="left",
+        max_distance=max_distance,
+        distance_col="gage_distance",
+    )
+
+
+def _plot_one_gage_hydrograph(
+    fig: plt.Figure,
+    qsim_df: pd.DataFrame,
+    usgs_site_id: str,
+    usgs_site_name: str,
+    usgs_datum: float,
+    parameter: str,
+    obs_parameter: str,
+    y_label_txt: str,
+    start_date: str,
+    end_date: str,
+    qsim_freq: pd.Timedelta,
+    image_path: str,
+    in_memory: bool = False,
+):
+    """
+    Plot the modeled and observed hydrograph of a single gage and calculate
+    the calibration metrics between them
+
+    Parameters
+    ----------
+    fig : plt.Figure
+        The figure to draw the hydrograph on, cleared first
+    qsim_df : pd.DataFrame
+        The modeled time series of the reference line matched to the gage
+    usgs_site_id : str
+        The USGS site number of the gage
+    usgs_site_name : str
+        The USGS station name of the gage
+    usgs_datum : float
+        The gage datum, added to the observed stage
+    parameter : str
+        The parameter to plot. One of 'Flow' or 'Stage'
+    obs_parameter : str
+        The NWIS parameter to query for the observed data
+    y_label_txt : str
+        The y-axis label
+    start_date : str
+        The start date of the calibration period formatted as 'YYYY-MM-DD'
+    end_date : str
+        The end date of the calibration period formatted as 'YYYY-MM-DD'
+    qsim_freq : pd.Timedelta
+        The timestep frequency of the modeled data
+    image_path : str
+        The file path to save the image to when not saving in memory
+    in_memory : bool
+        Whether to save the image to an in-memory stream instead of disk
+
+    Returns
+    -------
+    if no observed data is available:
+        None
+    else:
+        metrics : pd.DataFrame
+            The calibration metrics of the gage
+        timestep : str
+            The timestep frequency of the compared data
+        image : str or io.BytesIO
+            The file path to the saved image, or the in-memory image stream
+    """
+    qsim_df = qsim_df.copy()
+    qsim_df.columns = ["Modeled"]
+
+    # Observed streamflow: instantaneous values
+    qobs_df = get_nwis(usgs_site_id, obs_parameter, "iv", start_date, end_date)
+    if qobs_df is None:
+        print(
+            f"Instantaneous data for USGS station {usgs_site_id} is not available for the calibration period"
+        )
+        # Observed streamflow: daily values
+        qobs_df = get_nwis(usgs_site_id, obs_parameter, "dv", start_date, end_date)
+        if qobs_df is None:
+            print(
+                f"Daily data for USGS station {usgs_site_id} is not available for the calibration period"
+            )
+            return None
+
+    if parameter == "Stage":
+        qobs_df = qobs_df + usgs_datum
+
+    qobs_df.columns = ["Observed"]
+
+    # Resample the data to the same timestep frequency of the model
+    qobs_df, qsim_df, timestep = format_datetime(qobs_df, qsim_df, qsim_freq)
+
+    # Calculate the metrics between the observed and modeled streamflow
+    q_df = pd.merge(qobs_df, qsim_df, left_index=True, right_index=True).dropna()
+    qobs_df, qsim_df = None, None
+    metrics = calc_metrics(q_df, usgs_site_id)
+
+    # Reuse the figure of the caller instead of creating one per gage
+    fig.clf()
+    ax = fig.add_subplot()
+    # Plot the modeled vs observed streamflow
+    q_df["Observed"].plot(
+        ax=ax, color="blue", label="Observed", alpha=0.7, rasterized=True
+    )
+    q_df["Modeled"].plot(
+        ax=ax, color="red", label="Modeled", alpha=0.7, rasterized=True
+    )
+    # Add grid lines
+    ax.grid()
+    # Add a legend
+    ax.legend()
+    # Add axis labels
+    ax.set_xlabel("Date")
+    ax.set_ylabel(y_label_txt)
+    # Add a title
+    ax.set_title(f"USGS-{usgs_site_id} {usgs_site_name}")
+    # Set the custom y-axis formatter
+    ax.get_yaxis().set_major_formatter(
+        ticker.FuncFormatter(lambda x, p: format(int(x), ","))
+    )
+    # Save the figure
+    image = _save_figure(fig, image_path, in_memory=in_memory)
+    return metrics, timestep, image
+
+
+def _init_hydrograph_worker():
+    """
+    Create the figure that a gage hydrograph worker process draws on. The
+    figure lives as long as the worker process.
+    """
+    global _worker_figure
+    _worker_figure = plt.figure(figsize=(10, 10))
+
+
+def _plot_worker_hydrograph(*args):
+    """
+    Plot a gage hydrograph on the figure of the worker process
+
+    Parameters
+    ----------
+    *args
+        The arguments of _plot_one_gage_hydrograph, after the figure
+
+    Returns
+    -------
+    tuple or None
+        The result of _plot_one_gage_hydrograph
+    """
+    return _plot_one_gage_hydrograph(_worker_figure, *args)
+
+
 def plot_hydrographs(
     hdf_plan_file_path: str,
     df_gages_usgs: gpd.GeoDataFrame,
@@ -1545,26 +1990,6 @@ def plot_hydrographs(
         report_keywords : dict
             The updated values for the keywords
     """
-
-    # Open the HDF plan file for the reference line data
-    try:
-        plan_hdf = RasPlanHdf.open_uri(hdf_plan_file_path)
-    except Exception as e:
-        raise FileNotFoundError(
-            f"The provided HDF plan file {hdf_plan_file_path} does not exist. Please verify the file path."
-        ) from e
-    ref_lines = plan_hdf.reference_lines()
-    ref_lines = ref_lines.to_crs(epsg=4326)  # convert to EPSG:4326
-    ref_lines_ds = plan_hdf.reference_lines_timeseries_output()
-    # Get the simulation start and end times
-    plan_params = plan_hdf.get_plan_param_attrs()
-    plan_attrs = plan_hdf.get_plan_info_attrs()
-    start_time = plan_attrs["Simulation Start Time"]
-    end_time = plan_attrs["Simulation End Time"]
-    path_start_date = start_time.strftime("%Y-%m-%d")
-    path_end_date = end_time.strftime("%Y-%m-%d")
-    print(f"Calibration period: {path_start_date} to {path_end_date}")
-
     if parameter == "Flow":
         y_label_txt = "Streamflow (cfs)"
         sim_parameter = "Flow"
@@ -1574,219 +1999,130 @@ def plot_hydrographs(
         sim_parameter = "Water Surface"
         obs_parameter = "Stage"
 
-    # Units of degrees for EPSG:4326 to buffer outwards from the reference line location
-    buffer_increment = 0.001  # Ex: 0.001 degrees is approximately 100 meters
+    # Read the reference line data from the HDF plan file, which is closed afterwards
+    with ExitStack() as stack:
+        try:
+            plan_hdf = stack.enter_context(open_ras_hdf(hdf_plan_file_path, RasPlanHdf))
+        except Exception as e:
+            raise FileNotFoundError(
+                f"The provided HDF plan file {hdf_plan_file_path} does not exist. Please verify the file path."
+            ) from e
+        ref_lines = plan_hdf.reference_lines()
+        ref_lines = ref_lines.to_crs(epsg=4326)  # convert to EPSG:4326
+        ref_lines_ds = plan_hdf.reference_lines_timeseries_output()
+        # Load the modeled output once as a wide table with a column per reference
+        # line, while the file is open since rashdf may read the output lazily
+        qsim_wide = (
+            ref_lines_ds[sim_parameter].transpose("time", "refln_id").to_pandas()
+        )
+        # Get the simulation start and end times
+        plan_params = plan_hdf.get_plan_param_attrs()
+        plan_attrs = plan_hdf.get_plan_info_attrs()
+    start_time = plan_attrs["Simulation Start Time"]
+    end_time = plan_attrs["Simulation End Time"]
+    path_start_date = start_time.strftime("%Y-%m-%d")
+    path_end_date = end_time.strftime("%Y-%m-%d")
+    print(f"Calibration period: {path_start_date} to {path_end_date}")
+
+    # Units of degrees for EPSG:4326 to search outwards from the reference line location
+    max_gage_distance = 0.01  # Ex: 0.01 degrees is approximately 1 km
     # Loop through each reference line within the model
     print("Plotting hydrographs for each reference line")
     images_dict = {}
     metrics_list = []
     df_gages_usgs = df_gages_usgs.reset_index(drop=True)
-    for idx, line_id in enumerate(ref_lines.refln_id.values):
-        # Intersect the gages with the reference lines
-        gage_df = df_gages_usgs[
-            df_gages_usgs.within(ref_lines.geometry.buffer(buffer_increment).iloc[idx])
-        ]
-        # Trivial scenario: one row returned indicating one single gage is within the buffer distance
-        if len(gage_df) == 1:
-            # Site metadata
-            usgs_site_name = gage_df.station_nm.values[0]
-            usgs_site_id = gage_df.site_no.values[0]
-            station_id = f"USGS-{usgs_site_id}"
-            usgs_datum = gage_df.alt_va.values[0]
-            gage_idx = gage_df.index[0] + 1
-            print(f"Plotting {station_id} for reference line {line_id}")
-
-            # Modeled streamflow
-            qsim_df = (
-                ref_lines_ds.sel(refln_id=line_id)
-                [sim_parameter].to_dataframe()[sim_parameter]
-                .to_frame()
+    # The model output timestep is shared by all reference lines
+    qsim_freq = find_timstep_freq(qsim_wide)
+    # Match every reference line to its closest gage
+    gage_matches = _match_gages(ref_lines, df_gages_usgs, max_gage_distance)
+    gage_sites = []
+    gage_args = []
+    for line_id, gage_df in gage_matches.groupby("refln_id", sort=False):
+        gage_df = gage_df.dropna(subset=["index_right"])
+        # No gages are within the search distance of the reference line
+        if len(gage_df) == 0:
+            print(f"No gages found within ~1-km of the reference line: {line_id}.")
+            continue
+        # Multiple gages are equally close to the reference line
+        elif len(gage_df) > 1:
+            raise ValueError(
+                f"{len(gage_df)} gages found within the minimum distance of the reference line. {gage_df}."
             )
-            qsim_df.columns = ["Modeled"]
-
-            # Observed streamflow: instantaneous values
-            qobs_df = get_nwis(usgs_site_id, obs_parameter, 'iv', path_start_date, path_end_date)
-            if qobs_df is None:
-                print(
-                    f"Instantaneous data for USGS station {usgs_site_id} is not available for the calibration period"
-                )
-                # Observed streamflow: daily values
-                qobs_df = get_nwis(usgs_site_id, obs_parameter, 'dv', path_start_date, path_end_date)
-                if qobs_df is None:
-                    print(
-                        f"Daily data for USGS station {usgs_site_id} is not available for the calibration period"
-                    )
-                    continue
-
-            if parameter == "Stage":
-                qobs_df = qobs_df + usgs_datum
-
-            qobs_df.columns = ["Observed"]
-
-            # Resample the data to the same timestep frequency of the model
-            qobs_df, qsim_df, timestep = format_datetime(qobs_df, qsim_df)
-
-            # Calculate the metrics between the observed and modeled streamflow
-            q_df = pd.merge(
-                qobs_df, qsim_df, left_index=True, right_index=True
-            ).dropna()
-            qobs_df, qsim_df = None, None
-            metrics = calc_metrics(q_df, usgs_site_id)
-
-            # Generate the figure
-            fig, ax = plt.subplots(figsize=(10, 10))
-            # Plot the modeled vs observed streamflow
-            q_df["Observed"].plot(ax=ax, color="blue", label="Observed", alpha=0.7)
-            q_df["Modeled"].plot(ax=ax, color="red", label="Modeled", alpha=0.7)
-            # Add grid lines
-            ax.grid()
-            # Add a legend
-            ax.legend()
-            # Add axis labels
-            ax.set_xlabel("Date")
-            ax.set_ylabel(y_label_txt)
-            # Add a title
-            ax.set_title(f"USGS-{usgs_site_id} {usgs_site_name}")
-            # Set the custom y-axis formatter
-            ax.get_yaxis().set_major_formatter(
-                ticker.FuncFormatter(lambda x, p: format(int(x), ","))
+        # Site metadata
+        usgs_site_name = gage_df.station_nm.values[0]
+        usgs_site_id = gage_df.site_no.values[0]
+        station_id = f"USGS-{usgs_site_id}"
+        usgs_datum = gage_df.alt_va.values[0]
+        gage_idx = int(gage_df.index_right.values[0]) + 1
+        print(f"Plotting {station_id} for reference line {line_id}")
+
+        # Collect the modeled time series of the reference line for its gage
+        path = f"{domain_name}_{usgs_site_id}_plan0{plan_index}_{parameter}.png"
+        image_path = os.path.join(root_dir, path)
+        gage_sites.append((station_id, usgs_site_name, gage_idx, image_path))
+        gage_args.append(
+            (
+                qsim_wide[[line_id]],
+                usgs_site_id,
+                usgs_site_name,
+                usgs_datum,
+                parameter,
+                obs_parameter,
+                y_label_txt,
+                path_start_date,
+                path_end_date,
+                qsim_freq,
+                image_path,
+                report_document is not None,
             )
-            # Save the figure
-            path = f"{domain_name}_{usgs_site_id}_plan0{plan_index}_{parameter}.png"
-            image_path = os.path.join(root_dir, path)
-            fig.savefig(image_path, bbox_inches="tight")
+        )
+
+    # Plot the modeled vs observed hydrographs of the gages. Spawned workers must
+    # re-import this module and its dependencies, which only pays off for many gages
+    if len(gage_args) < _MIN_PARALLEL_GAGES:
+        # Draw every gage on one figure, closed once the gages are plotted
+        fig = plt.figure(figsize=(10, 10))
+        try:
+            hydrographs = [_plot_one_gage_hydrograph(fig, *args) for args in gage_args]
+        finally:
             plt.close(fig)
-            if (
-                report_document is None
-                and report_keywords is None
-            ):
-                images_dict[station_id] = image_path
-                metrics_list.append(metrics)
-            else:
-                # Search for the keyword within the document and add the image above it
-                report_document = add_image_to_keyword(
-                    report_document,
-                    f"«plan0{plan_index}_figure_gage_{parameter}»",
-                    image_path,
-                )
-                os.remove(image_path)
-                metrics_list.append(metrics)
-                # Update the report text for Table 9: Two-Dimensional Computational Solver Tolerances and Settings
-                report_keywords = fill_computation_settings_table(report_keywords, plan_params, plan_attrs, plan_index)
-                # Update the report text for Table 11: Gage Calibration Timesteps
-                report_keywords[f'table11_gage0{gage_idx}_name'] = usgs_site_name
-                report_keywords[f'plan0{plan_index}_gage0{gage_idx}_{parameter.lower()}_ts'] = timestep
-                
-        # Non-trivial scenario: no rows returned indicating no gages are within the buffer distance
-        # Need to buffer out the reference line until the closest gage (within reason) is found
-        elif len(gage_df) == 0:
-            # Increment the buffer distance
-            while len(gage_df) == 0:
-                buffer_increment += 0.001
-                if buffer_increment > 0.01:
-                    print(
-                        f"No gages found within ~1-km of the reference line: {line_id}."
-                    )
-                    break
-                else:
-                    print(
-                        f"No gages found near the reference line {line_id}. Incrementing buffer distance by ~100-m."
-                    )
-                    gage_df = df_gages_usgs[
-                        df_gages_usgs.within(
-                            ref_lines.geometry.buffer(buffer_increment).iloc[idx]
-                        )
-                    ]
-            if len(gage_df) == 1:
-                # Site metadata
-                usgs_site_name = gage_df.station_nm.values[0]
-                usgs_site_id = gage_df.site_no.values[0]
-                station_id = f"USGS-{usgs_site_id}"
-                usgs_datum = gage_df.alt_va.values[0]
-                gage_idx = gage_df.index[0] + 1
-                print(f"Gage index: {gage_idx}")
-                print(f"Plotting {station_id} for reference line {line_id}")
-
-                # Modeled streamflow
-                qsim_df = (
-                    ref_lines_ds.sel(refln_id=line_id)
-                    [sim_parameter].to_dataframe()[sim_parameter]
-                    .to_frame()
-                )
-                qsim_df.columns = ["Modeled"]
-
-                # Observed streamflow
-                qobs_df = get_nwis(usgs_site_id, obs_parameter, path_start_date, path_end_date)
-                if qobs_df is None:
-                    print(
-                        f"USGS station {usgs_site_id} is not available for the calibration period"
-                    )
-                    continue
-
-                if parameter == "Stage":
-                    qobs_df = qobs_df + usgs_datum
-
-                qobs_df.columns = ["Observed"]
-
-                # Resample the data to the same timestep frequency of the model
-                qobs_df, qsim_df, timestep = format_datetime(qobs_df, qsim_df)
-
-                # Calculate the metrics between the observed and modeled streamflow
-                q_df = pd.merge(
-                    qobs_df, qsim_df, left_index=True, right_index=True
-                ).dropna()
-                qobs_df, qsim_df = None, None
-                metrics = calc_metrics(q_df, usgs_site_id)
-
-                # Generate the figure
-                fig, ax = plt.subplots(figsize=(10, 10))
-                # Plot the modeled vs observed streamflow
-                q_df["Observed"].plot(
-                    ax=ax, color="blue", label="Observed", alpha=0.7
-                )
-                q_df["Modeled"].plot(ax=ax, color="red", label="Modeled", alpha=0.7)
-                # Add grid lines
-                ax.grid()
-                # Add a legend
-                ax.legend()
-                # Add axis labels
-                ax.set_xlabel("Date")
-                ax.set_ylabel(y_label_txt)
-                # Add a title
-                ax.set_title(f"USGS-{usgs_site_id} {usgs_site_name}")
-                # Set the custom y-axis formatter
-                ax.get_yaxis().set_major_formatter(
-                    ticker.FuncFormatter(lambda x, p: format(int(x), ","))
-                )
-                # Save the figure
-                path = f"{domain_name}_{usgs_site_id}_plan0{plan_index}_{parameter}.png"
-                image_path = os.path.join(root_dir,path)
-                fig.savefig(image_path, bbox_inches="tight")
-                plt.close(fig)
-                if (
-                    report_document is None
-                    and report_keywords is None
-                ):
-                    images_dict[station_id] = image_path
-                    metrics_list.append(metrics)
-                else:
-                    # Search for the keyword within the document and add the image above it
-                    report_document = add_image_to_keyword(
-                        report_document,
-                        f"«plan0{plan_index}_figure_gage_{parameter}»",
-                        image_path,
-                    )
-                    os.remove(image_path)
-                    metrics_list.append(metrics)
-                    # Update the report text for Table 9: Two-Dimensional Computational Solver Tolerances and Settings
-                    report_keywords = fill_computation_settings_table(report_keywords, plan_params, plan_attrs, plan_index)
-                    # Update the report text for Table 11: Gage Calibration Timesteps
-                    report_keywords[f'table11_gage0{gage_idx}_name'] = usgs_site_name
-                    report_keywords[f'plan0{plan_index}_gage0{gage_idx}_{parameter.lower()}_ts'] = timestep
-            elif len(gage_df) > 1:
-                raise ValueError(
-                    f"{len(gage_df)} gages found within the minimum buffer distance of the reference line. {gage_df}."
-                )
+    else:
+        # Each worker process draws its gages on a figure of its own
+        with ProcessPoolExecutor(
+            max_workers=min(len(gage_args), os.cpu_count() or 1),
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_hydrograph_worker,
+        ) as executor:
+            hydrographs = list(executor.map(_plot_worker_hydrograph, *zip(*gage_args)))
+
+    # Add the hydrographs to the report in the order of the reference lines
+    for (station_id, usgs_site_name, gage_idx, image_path), hydrograph in zip(
+        gage_sites, hydrographs
+    ):
+        if hydrograph is None:
+            continue
+        metrics, timestep, image = hydrograph
+        if report_document is None and report_keywords is None:
+            images_dict[station_id] = image_path
+            metrics_list.append(metrics)
+        else:
+            # Search for the keyword within the document and add the image above it
+            report_document = add_image_to_keyword(
+                report_document,
+                f"«plan0{plan_index}_figure_gage_{parameter}»",
+                image,
+            )
+            metrics_list.append(metrics)
+            # Update the report text for Table 9: Two-Dimensional Computational Solver Tolerances and Settings
+            report_keywords = fill_computation_settings_table(
+                report_keywords, plan_params, plan_attrs, plan_index
+            )
+            # Update the report text for Table 11: Gage Calibration Timesteps
+            report_keywords[f"table11_gage0{gage_idx}_name"] = usgs_site_name
+            report_keywords[
+                f"plan0{plan_index}_gage0{gage_idx}_{parameter.lower()}_ts"
+            ] = timestep
+
     if report_document is None and report_keywords is None:
         # Combine the metrics into a single dataframe
         if len(metrics_list) == 0:
@@ -4,23 +4,173 @@
 
 import os
 import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 import h5py
-import fsspec
 import pandas as pd
 import numpy as np
 import geopandas as gpd
+import shapely
 from shapely.geometry import Polygon
 from rashdf import RasPlanHdf, RasGeomHdf
-from pyproj import CRS
-import fsspec
+from pyproj import CRS, Transformer
 from typing import Optional
 
+# Read remote HDF files in large cached blocks rather than one request per read
+_S3_FSSPEC_KWARGS = {"block_size": 2**23, "cache_type": "blockcache"}
+# Enlarge the HDF5 raw chunk cache from its 1 MiB default, with a prime number of slots
+_H5PY_KWARGS = {"rdcc_nbytes": 64 * 1024**2, "rdcc_nslots": 1_000_003}
+# RAS HDF files shared within a cached_ras_hdf_files block, keyed by path and rashdf
+# class. A context variable keeps the files of each thread and asyncio task apart.
+_CACHED_HDF_FILES = contextvars.ContextVar("cached_hdf_files", default=None)
+
 # Functions ###################################################################
 
 
+@lru_cache(maxsize=16)
+def _crs_wkt(crs: str):
+    """
+    Parse a coordinate system definition into its WKT, once per definition
+
+    Parameters
+    ----------
+    crs : str
+        The coordinate system, as an authority string (EPSG:4326) or WKT
+
+    Returns
+    -------
+    wkt : str
+        The WKT of the coordinate system
+    """
+    return CRS.from_user_input(crs).to_wkt()
+
+
+@lru_cache(maxsize=64)
+def _get_transformer(src_wkt: str, dst_wkt: str):
+    """
+    Build a coordinate transformer between two coordinate systems, once per pair
+
+    Parameters
+    ----------
+    src_wkt : str
+        The WKT of the source coordinate system
+    dst_wkt : str
+        The WKT of the destination coordinate system
+
+    Returns
+    -------
+    transformer : Transformer
+        The transformer with x/y (lon/lat) axis order
+    """
+    return Transformer.from_crs(src_wkt, dst_wkt, always_xy=True)
+
+
+def _reproject(gdf: gpd.GeoDataFrame, dst: str = "EPSG:4326"):
+    """
+    Reproject a GeoDataFrame with a cached coordinate transformer
+
+    Parameters
+    ----------
+    gdf : gpd.GeoDataFrame
+        The GeoDataFrame to reproject
+    dst : str
+        The destination coordinate system
+
+    Returns
+    -------
+    gdf : gpd.GeoDataFrame
+        The reprojected GeoDataFrame
+    """
+    # Nothing to transform for empty frames or those already in the destination CRS
+    if gdf.empty or gdf.crs == dst:
+        return gdf.set_crs(dst, allow_override=True)
+    transformer = _get_transformer(gdf.crs.to_wkt(), _crs_wkt(dst))
+    # Transform the raw coordinate array and write it back into the geometries
+    geometry = np.asarray(gdf.geometry.values).copy()
+    x, y = shapely.get_coordinates(geometry).T
+    geometry = shapely.set_coordinates(
+        geometry, np.column_stack(transformer.transform(x, y))
+    )
+    return gdf.set_geometry(geometry, crs=dst)
+
+
+def _reproject_many(gdfs: list, dst: str = "EPSG:4326"):
+    """
+    Reproject several GeoDataFrames in a single pass over their coordinates.
+    The coordinates are transformed in chunks on a thread pool, as pyproj
+    releases the GIL while transforming.
+
+    Parameters
+    ----------
+    gdfs : list
+        The GeoDataFrames to reproject. Those with a different coordinate system
+        than the first are reprojected on their own.
+    dst : str
+        The destination coordinate system
+
+    Returns
+    -------
+    gdfs : list
+        The reprojected GeoDataFrames, in the same order
+    """
+    src_crs = gdfs[0].crs
+    batch = [i for i, gdf in enumerate(gdfs) if gdf.crs == src_crs and not gdf.empty]
+    # Nothing to transform in a single pass, reproject (or skip) each one on its own
+    if len(batch) == 0 or src_crs == dst:
+        return [_reproject(gdf, dst) for gdf in gdfs]
+    # Gather the coordinates of every geometry in the batch into one array
+    geometries = np.concatenate([np.asarray(gdfs[i].geometry.values) for i in batch])
+    coords = shapely.get_coordinates(geometries)
+    transformer = _get_transformer(src_crs.to_wkt(), _crs_wkt(dst))
+    chunks = np.array_split(coords, max(min(os.cpu_count() or 1, len(coords)), 1))
+    with ThreadPoolExecutor() as executor:
+        projected = list(
+            executor.map(
+                lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])),
+                chunks,
+            )
+        )
+    geometries = shapely.set_coordinates(geometries.copy(), np.concatenate(projected))
+    # Split the reprojected geometries back into their GeoDataFrames
+    splits = np.cumsum([len(gdfs[i]) for i in batch])[:-1]
+    reprojected = dict(zip(batch, np.split(geometries, splits)))
+    return [
+        gdf.set_geometry(reprojected[i], crs=dst)
+        if i in reprojected
+        else _reproject(gdf, dst)
+        for i, gdf in enumerate(gdfs)
+    ]
+
+
+def _simplify_union(geometries: gpd.GeoSeries, tolerance: float):
+    """
+    Simplify geometries and merge them into a single geometry
+
+    Parameters
+    ----------
+    geometries : gpd.GeoSeries
+        The geometries to simplify
+    tolerance : float
+        The simplification tolerance, in the units of the coordinate system
+
+    Returns
+    -------
+    geometry : shapely.Geometry
+        The simplified geometry, or the union of the simplified geometries
+    """
+    geometries = np.asarray(geometries.values)
+    # A single geometry only needs simplifying, there is nothing to merge it with
+    if len(geometries) == 1:
+        return shapely.simplify(geometries[0], tolerance)
+    return shapely.union_all(shapely.simplify(geometries, tolerance))
+
+
+@lru_cache(maxsize=None)
 def init_s3_keys():
     """
-    Initialize the os environment variables for AWS S3
+    Initialize the os environment variables for AWS S3, once per session
     """
     from dotenv import load_dotenv
 
@@ -30,6 +180,101 @@ def init_s3_keys():
     os.environ["AWS_SECRET_ACCESS_KEY"] = os.getenv("AWS_SECRET_ACCESS_KEY")
 
 
+def _open_ras_hdf(hdf_file_path: str, hdf_class: type):
+    """
+    Open a RAS HDF file from an S3 URI or a local file path. Remote files are
+    read through an 8 MiB block cache, so that the many small HDF5 metadata
+    reads are served from a few large requests.
+
+    Parameters
+    ----------
+    hdf_file_path : str
+        The S3 URI or the local file path to the HDF file
+    hdf_class : type
+        The rashdf class to open the file with. One of RasGeomHdf or RasPlanHdf
+
+    Returns
+    -------
+    hdf : RasGeomHdf or RasPlanHdf
+        The opened HDF file
+    """
+    # Open the HDF file from the S3 bucket
+    if hdf_file_path.startswith("s3://"):
+        # initialize the S3 keys
+        try:
+            init_s3_keys()
+            return hdf_class.open_uri(
+                hdf_file_path,
+                fsspec_kwargs=_S3_FSSPEC_KWARGS,
+                h5py_kwargs=_H5PY_KWARGS,
+            )
+        except Exception as e:
+            raise ValueError(
+                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
+            )
+    # Open the HDF file from the local file path
+    else:
+        return hdf_class(hdf_file_path, **_H5PY_KWARGS)
+
+
+@contextmanager
+def cached_ras_hdf_files():
+    """
+    Share the RAS HDF files opened by open_ras_hdf within the block, such as one
+    report run, and close them when the block exits. The files are only shared
+    within the current thread or asyncio task, so concurrent Streamlit sessions
+    never read or close each other's files. A nested block uses the files of
+    the outermost block.
+    """
+    if _CACHED_HDF_FILES.get() is not None:
+        yield
+        return
+    hdf_files = {}
+    token = _CACHED_HDF_FILES.set(hdf_files)
+    try:
+        yield
+    finally:
+        _CACHED_HDF_FILES.reset(token)
+        for hdf in hdf_files.values():
+            hdf.close()
+
+
+@contextmanager
+def open_ras_hdf(hdf_file_path: str, hdf_class: type):
+    """
+    Open a RAS HDF file for the duration of a with block. Within a
+    cached_ras_hdf_files block the file is opened once, shared with the other
+    reads of the block and closed when that block exits. Otherwise the file is
+    closed when this block exits.
+
+    Parameters
+    ----------
+    hdf_file_path : str
+        The S3 URI or the local file path to the HDF file
+    hdf_class : type
+        The rashdf class to open the file with. One of RasGeomHdf or RasPlanHdf
+
+    Yields
+    ------
+    hdf : RasGeomHdf or RasPlanHdf
+        The opened HDF file
+    """
+    hdf_files = _CACHED_HDF_FILES.get()
+    # Open the file for this block only
+    if hdf_files is None:
+        hdf = _open_ras_hdf(hdf_file_path, hdf_class)
+        try:
+            yield hdf
+        finally:
+            hdf.close()
+        return
+    # Reuse the file if it is already open within the cached block
+    key = (hdf_file_path, hdf_class)
+    if key not in hdf_files:
+        hdf_files[key] = _open_ras_hdf(hdf_file_path, hdf_class)
+    yield hdf_files[key]
+
+
 def get_model_perimeter(
     hdf_file_path: str, input_domain_id: Optional[str], project_to_4326: bool
 ):
@@ -53,25 +298,13 @@ def get_model_perimeter(
     new_crs = "EPSG:4326"
     simplify_threshold = 300  # distance in feet
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasGeomHdf) as geom_hdf:
+        # First try to get the mesh areas. If this fails, exit the function
         try:
-            init_s3_keys()
-            geom_hdf = RasGeomHdf.open_uri(hdf_file_path)
+            perimeter = geom_hdf.mesh_areas()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
-            )
-    else:
-        # Open the HDF file from the local file path
-        geom_hdf = RasGeomHdf(hdf_file_path)
-
-    # First try to get the mesh areas. If this fails, exit the function
-    try:
-        perimeter = geom_hdf.mesh_areas()
-    except Exception as e:
-        raise ValueError(f"Error getting the mesh areas: {e}")
+            raise ValueError(f"Error getting the mesh areas: {e}")
 
     # Check if there is only one domain
     domain_id = perimeter["mesh_name"].unique()
@@ -83,17 +316,21 @@ def get_model_perimeter(
         else:
             perimeter = perimeter[perimeter["mesh_name"] == input_domain_id]
             # Simplify the perimeter to avoid issues with overlapping vertices
-            perimeter_geom = perimeter.simplify(simplify_threshold).union_all()
-            perimeter.geometry.iloc[0] = perimeter_geom
+            perimeter_geom = _simplify_union(perimeter.geometry, simplify_threshold)
+            perimeter = perimeter.set_geometry(
+                [perimeter_geom, *perimeter.geometry.iloc[1:]], crs=perimeter.crs
+            )
             if project_to_4326:
-                perimeter = perimeter.to_crs(new_crs)
+                perimeter = _reproject(perimeter, new_crs)
             return perimeter
     elif len(domain_id) == 1:
         # Simplify the perimeter to avoid issues with overlapping vertices
-        perimeter_geom = perimeter.simplify(simplify_threshold).union_all()
-        perimeter.geometry.iloc[0] = perimeter_geom
+        perimeter_geom = _simplify_union(perimeter.geometry, simplify_threshold)
+        perimeter = perimeter.set_geometry(
+            [perimeter_geom, *perimeter.geometry.iloc[1:]], crs=perimeter.crs
+        )
         if project_to_4326:
-            perimeter = perimeter.to_crs(new_crs)
+            perimeter = _reproject(perimeter, new_crs)
         return perimeter
 
 
@@ -115,33 +352,21 @@ def get_model_breaklines(hdf_file_path: str, project_to_4326: bool):
     """
     new_crs = "EPSG:4326"
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasGeomHdf) as geom_hdf:
+        # Get the breaklines
         try:
-            init_s3_keys()
-            geom_hdf = RasGeomHdf.open_uri(hdf_file_path)
+            breaklines = geom_hdf.breaklines()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
+            # If the breaklines are not available, create an empty GeoDataFrame
+            print(f"Error getting the breaklines: {e}")
+            print("Creating an empty GeoDataFrame for the breaklines")
+            breaklines = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
             )
-    else:
-        # Open the HDF file from the local file path
-        geom_hdf = RasGeomHdf(hdf_file_path)
-
-    # Get the breaklines
-    try:
-        breaklines = geom_hdf.breaklines()
-    except Exception as e:
-        # If the breaklines are not available, create an empty GeoDataFrame
-        print(f"Error getting the breaklines: {e}")
-        print("Creating an empty GeoDataFrame for the breaklines")
-        breaklines = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
     if project_to_4326:
         # Convert the CRS to EPSG:4326
-        breaklines = breaklines.to_crs(new_crs)
+        breaklines = _reproject(breaklines, new_crs)
 
     return breaklines
 
@@ -164,33 +389,21 @@ def get_model_cell_polygons(hdf_file_path: str, project_to_4326: bool):
     """
     new_crs = "EPSG:4326"
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasGeomHdf) as geom_hdf:
+        # Get the mesh cell polygons
         try:
-            init_s3_keys()
-            geom_hdf = RasGeomHdf.open_uri(hdf_file_path)
+            cell_polygons = geom_hdf.mesh_cell_polygons()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
+            # If the mesh cell polygons are not available, create an empty GeoDataFrame
+            print(f"Error getting the mesh cell polygons: {e}")
+            print("Creating an empty GeoDataFrame for the cell polygons")
+            cell_polygons = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
             )
-    else:
-        # Open the HDF file from the local file path
-        geom_hdf = RasGeomHdf(hdf_file_path)
-
-    # Get the mesh cell polygons
-    try:
-        cell_polygons = geom_hdf.mesh_cell_polygons()
-    except Exception as e:
-        # If the mesh cell polygons are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell polygons: {e}")
-        print("Creating an empty GeoDataFrame for the cell polygons")
-        cell_polygons = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
     if project_to_4326:
         # Convert the CRS to EPSG:4326
-        cell_polygons = cell_polygons.to_crs(new_crs)
+        cell_polygons = _reproject(cell_polygons, new_crs)
 
     return cell_polygons
 
@@ -210,36 +423,24 @@ def get_plan_cell_pts(hdf_file_path: str):
         The cell points GeoDataFrame
     """
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasPlanHdf) as plan_hdf:
+        # First get the mesh areas. If this fails, exit the function
         try:
-            init_s3_keys()
-            plan_hdf = RasPlanHdf.open_uri(hdf_file_path)
+            perimeter = plan_hdf.mesh_areas()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
-            )
-    else:
-        # Open the HDF file from the local file path
-        plan_hdf = RasPlanHdf(hdf_file_path)
-
-    # First get the mesh areas. If this fails, exit the function
-    try:
-        perimeter = plan_hdf.mesh_areas()
-    except Exception as e:
-        raise ValueError(f"Error getting the mesh areas: {e}")
+            raise ValueError(f"Error getting the mesh areas: {e}")
 
-    # Get the mesh cell points
-    try:
-        cell_points = plan_hdf.mesh_cell_points()
-    except Exception as e:
-        # If the mesh cell points are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell points: {e}")
-        print("Creating an empty GeoDataFrame for the cell points")
-        cell_points = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
+        # Get the mesh cell points
+        try:
+            cell_points = plan_hdf.mesh_cell_points()
+        except Exception as e:
+            # If the mesh cell points are not available, create an empty GeoDataFrame
+            print(f"Error getting the mesh cell points: {e}")
+            print("Creating an empty GeoDataFrame for the cell points")
+            cell_points = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
+            )
     return cell_points
 
 
@@ -259,28 +460,16 @@ def get_plan_params_attrs(hdf_file_path: str):
     plan_attrs : dict
         The plan attributes
     """
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
-        try:
-            init_s3_keys()
-            plan_hdf = RasPlanHdf.open_uri(hdf_file_path)
-        except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
-            )
-    else:
-        # Open the HDF file from the local file path
-        plan_hdf = RasPlanHdf(hdf_file_path)
-
-    # Get the simulation plan info attributes
-    plan_params = plan_hdf.get_plan_param_attrs()
-    plan_attrs = plan_hdf.get_plan_info_attrs()
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasPlanHdf) as plan_hdf:
+        # Get the simulation plan info attributes
+        plan_params = plan_hdf.get_plan_param_attrs()
+        plan_attrs = plan_hdf.get_plan_info_attrs()
 
     return plan_params, plan_attrs
 
 
-def get_plan_cell_points(hdf_file_path: str):
+def get_plan_cell_points(hdf_file_path: str, columns: Optional[list] = None):
     """
     Get the cell point solution data from the plan HDF file
 
@@ -288,41 +477,63 @@ def get_plan_cell_points(hdf_file_path: str):
     ----------
     hdf_file_path : str
         The file path to the HDF file
+    columns : list
+        The columns to keep besides the geometry, or all if None
 
     Returns
     -------
     cell_points : gpd.GeoDataFrame
         The cell points GeoDataFrame
     """
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasPlanHdf) as plan_hdf:
+        # Get the mesh cell points
         try:
-            init_s3_keys()
-            plan_hdf = RasPlanHdf.open_uri(hdf_file_path)
+            cell_points = plan_hdf.mesh_cell_points()
+            # Keep only the requested columns
+            if columns:
+                cell_points = cell_points[["geometry", *columns]]
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
+            # If the mesh cell points are not available, create an empty GeoDataFrame
+            print(f"Error getting the mesh cell points: {e}")
+            print("Creating an empty GeoDataFrame for the cell points")
+            cell_points = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
             )
-    else:
-        # Open the HDF file from the local file path
-        plan_hdf = RasPlanHdf(hdf_file_path)
-
-    # Get the mesh cell points
-    try:
-        cell_points = plan_hdf.mesh_cell_points()
-    except Exception as e:
-        # If the mesh cell points are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell points: {e}")
-        print("Creating an empty GeoDataFrame for the cell points")
-        cell_points = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
 
     return cell_points
 
 
-def get_bulk_hdf_plan(hdf_file_path: str, input_domain_id: str):
+def calc_time_to_peak(cell_points: pd.DataFrame):
+    """
+    Calculate the time to peak of each cell, from the simulation start time to
+    the time of the cell's max water surface elevation
+
+    Parameters
+    ----------
+    cell_points : pd.DataFrame
+        The cell points with the 'min_ws_time' and 'max_ws_time' columns
+
+    Returns
+    -------
+    ttp_hrs : np.ndarray
+        The time to peak (hours) of each cell, NaN where a time is missing
+    """
+    min_times = cell_points["min_ws_time"].to_numpy(dtype="datetime64[ns]")
+    max_times = cell_points["max_ws_time"].to_numpy(dtype="datetime64[ns]")
+    # Use the global min water surface elevation time as the simulation start time
+    valid_min_times = min_times[~np.isnat(min_times)]
+    if len(valid_min_times) > 0:
+        start_time = valid_min_times.min()
+    else:
+        start_time = np.datetime64("NaT", "ns")
+    # Missing (NaT) times propagate to NaN hours
+    return (max_times - start_time) / np.timedelta64(1, "h")
+
+
+def get_bulk_hdf_plan(
+    hdf_file_path: str, input_domain_id: str, columns: Optional[list] = None
+):
     """
     Get the HDF data
 
@@ -332,6 +543,8 @@ def get_bulk_hdf_plan(hdf_file_path: str, input_domain_id: str):
         The file path to the HDF file
     input_domain_id : str
         A user specified domain ID
+    columns : list
+        The cell point columns to keep besides the geometry, or all if None
 
     Returns
     -------
@@ -344,43 +557,34 @@ def get_bulk_hdf_plan(hdf_file_path: str, input_domain_id: str):
     """
     new_crs = "EPSG:4326"
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasPlanHdf) as plan_hdf:
+        # First get the mesh areas. If this fails, exit the function
         try:
-            init_s3_keys()
-            plan_hdf = RasPlanHdf.open_uri(hdf_file_path)
+            perimeter = plan_hdf.mesh_areas()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
-            )
-    else:
-        # Open the HDF file from the local file path
-        plan_hdf = RasPlanHdf(hdf_file_path)
-
-    # First get the mesh areas. If this fails, exit the function
-    try:
-        perimeter = plan_hdf.mesh_areas()
-    except Exception as e:
-        raise ValueError(f"Error getting the mesh areas: {e}")
+            raise ValueError(f"Error getting the mesh areas: {e}")
 
-    # Get the mesh cell points
-    try:
-        cell_points = plan_hdf.mesh_cell_points()
-    except Exception as e:
-        # If the mesh cell points are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell points: {e}")
-        print("Creating an empty GeoDataFrame for the cell points")
-        cell_points = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
+        # Get the mesh cell points
+        try:
+            cell_points = plan_hdf.mesh_cell_points()
+            # Keep only the requested columns
+            if columns:
+                cell_points = cell_points[["geometry", *columns]]
+        except Exception as e:
+            # If the mesh cell points are not available, create an empty GeoDataFrame
+            print(f"Error getting the mesh cell points: {e}")
+            print("Creating an empty GeoDataFrame for the cell points")
+            cell_points = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
+            )
 
-    # Get the simulation plan info attributes
-    plan_params = plan_hdf.get_plan_param_attrs()
-    plan_attrs = plan_hdf.get_plan_info_attrs()
+        # Get the simulation plan info attributes
+        plan_params = plan_hdf.get_plan_param_attrs()
+        plan_attrs = plan_hdf.get_plan_info_attrs()
 
     # Convert the CRS to EPSG:4326
-    cell_points = cell_points.to_crs(new_crs)
+    cell_points = _reproject(cell_points, new_crs)
     # Check if there is only one domain
     domain_id = perimeter["mesh_name"].unique()
     if len(domain_id) > 1:
@@ -412,81 +616,60 @@ def get_bulk_hdf_geom(hdf_file_path: str, input_domain_id: str):
     -------
     perimeter : gpd.GeoDataFrame
         The perimeter of the mesh
-    perimeter_geojson : dict
-        The geojson object
     domain_id : str
         The domain ID
     cell_polygons : gpd.GeoDataFrame
         The cell polygons GeoDataFrame
     breaklines : gpd.GeoDataFrame
         The breaklines GeoDataFrame
+    proj_table : dict
+        The projection information of the HDF file
     """
     new_crs = "EPSG:4326"
 
-    # Open the HDF file from the S3 bucket
-    if hdf_file_path.startswith("s3://"):
-        # initialize the S3 keys
+    # Open the HDF file from the S3 bucket or the local file path
+    with open_ras_hdf(hdf_file_path, RasGeomHdf) as geom_hdf:
+        # First get the mesh areas. If this fails, exit the function
         try:
-            init_s3_keys()
-            geom_hdf = RasGeomHdf.open_uri(hdf_file_path)
+            perimeter = geom_hdf.mesh_areas()
         except Exception as e:
-            raise ValueError(
-                f"Error initializing the S3 keys. Check your AWS credentials. {e}"
-            )
-    else:
-        # Open the HDF file from the local file path
-        geom_hdf = RasGeomHdf(hdf_file_path)
+            raise ValueError(f"Error getting the mesh areas: {e}")
 
-    # First get the mesh areas. If this fails, exit the function
-    try:
-        perimeter = geom_hdf.mesh_areas()
-    except Exception as e:
-        raise ValueError(f"Error getting the mesh areas: {e}")
-
-    # Get the mesh cell points
-    try:
-        cell_points = geom_hdf.mesh_cell_points()
-    except Exception as e:
-        # If the mesh cell points are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell points: {e}")
-        print("Creating an empty GeoDataFrame for the cell points")
-        cell_points = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
+        # Get the mesh cell polygons
+        try:
+            cell_polygons = geom_hdf.mesh_cell_polygons()
+        except Exception as e:
+            # If the mesh cell polygons are not available, create an empty GeoDataFrame
+            print(f"Error getting the mesh cell polygons: {e}")
+            print("Creating an empty GeoDataFrame for the cell polygons")
+            cell_polygons = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
+            )
 
-    # Get the mesh cell polygons
-    try:
-        cell_polygons = geom_hdf.mesh_cell_polygons()
-    except Exception as e:
-        # If the mesh cell polygons are not available, create an empty GeoDataFrame
-        print(f"Error getting the mesh cell polygons: {e}")
-        print("Creating an empty GeoDataFrame for the cell polygons")
-        cell_polygons = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
+        # Get the breaklines
+        try:
+            breaklines = geom_hdf.breaklines()
+        except Exception as e:
+            # If the breaklines are not available, create an empty GeoDataFrame
+            print(f"Error getting the breaklines: {e}")
+            print("Creating an empty GeoDataFrame for the breaklines")
+            breaklines = gpd.GeoDataFrame(
+                [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
+            )
 
-    # Get the breaklines
-    try:
-        breaklines = geom_hdf.breaklines()
-    except Exception as e:
-        # If the breaklines are not available, create an empty GeoDataFrame
-        print(f"Error getting the breaklines: {e}")
-        print("Creating an empty GeoDataFrame for the breaklines")
-        breaklines = gpd.GeoDataFrame(
-            [], columns=["x", "y"], geometry=[], crs="EPSG:4326"
-        )
+        # Get the projection information
+        proj_table = hdf_projection_table(geom_hdf)
     # Simplify the perimeter to avoid issues with overlapping vertices
     simplify_threshold = 300  # distance in feet
-    perimeter_geom = perimeter.simplify(simplify_threshold).union_all()
-    perimeter.geometry.iloc[0] = perimeter_geom
+    perimeter_geom = _simplify_union(perimeter.geometry, simplify_threshold)
+    perimeter = perimeter.set_geometry(
+        [perimeter_geom, *perimeter.geometry.iloc[1:]], crs=perimeter.crs
+    )
 
     # Convert the CRS to EPSG:4326
-    cell_points = cell_points.to_crs(new_crs)
-    cell_polygons = cell_polygons.to_crs(new_crs)
-    perimeter = perimeter.to_crs(new_crs)
-    breaklines = breaklines.to_crs(new_crs)
-    # Get the projection information
-    proj_table = hdf_projection_table(geom_hdf)
+    perimeter, cell_polygons, breaklines = _reproject_many(
+        [perimeter, cell_polygons, breaklines], new_crs
+    )
     # Check if there is only one domain
     domain_id = perimeter["mesh_name"].unique()
     if len(domain_id) > 1:
@@ -526,27 +709,44 @@ def hdf_projection_table(plan_hdf: h5py.File):
 
     # Read the projection from the hdf file
     proj = plan_hdf.projection()
-    proj = proj.to_json_dict()
-
-    # Extract the projection information
-    projcs = proj["name"]
-    geogcs = proj["base_crs"]["name"]
-    datum = proj["base_crs"]["datum"]["name"]
-    ellipsoid = proj["base_crs"]["datum"]["ellipsoid"]["name"]
-    method = proj["conversion"]["method"]["name"]
-    authority = proj["conversion"]["method"]["id"]["authority"]
-    code = proj["conversion"]["method"]["id"]["code"]
-    unit = proj["coordinate_system"]["axis"][0]["unit"]["name"]
+
+    # Parse the projection once per unique projection, not once per file
+    return dict(_proj_table_from_wkt(proj.to_wkt()))
+
+
+@lru_cache(maxsize=16)
+def _proj_table_from_wkt(wkt: str):
+    """
+    Extract the projection information from the WKT of a projection
+
+    Parameters
+    ----------
+    wkt : str
+        The WKT of the projection
+
+    Returns
+    -------
+    proj_table_items : dict
+        Dictionary containing the projection information. Missing fields are None.
+    """
+    proj = CRS.from_wkt(wkt).to_json_dict()
+    base_crs = proj.get("base_crs", {})
+    datum = base_crs.get("datum", {})
+    method = proj.get("conversion", {}).get("method", {})
+    axis = proj.get("coordinate_system", {}).get("axis", [{}])[0]
+    # Common units such as metre are given by name only
+    unit = axis.get("unit", {})
+    unit = unit if isinstance(unit, str) else unit.get("name")
 
     # Create a dictionary with the projection information
     proj_table_items = {
-        "projcs": projcs,
-        "geogcs": geogcs,
-        "datum": datum,
-        "ellipsoid": ellipsoid,
-        "method": method,
-        "authority": authority,
-        "code": code,
+        "projcs": proj.get("name"),
+        "geogcs": base_crs.get("name"),
+        "datum": datum.get("name"),
+        "ellipsoid": datum.get("ellipsoid", {}).get("name"),
+        "method": method.get("name"),
+        "authority": method.get("id", {}).get("authority"),
+        "code": method.get("id", {}).get("code"),
         "unit": unit,
     }
 
@@ -4,13 +4,12 @@
 
 import os
 import warnings
-import h5py
-import fsspec
-import pandas as pd
 import numpy as np
 import geopandas as gpd
 import matplotlib.pyplot as plt
 
+from hdf_utils import calc_time_to_peak
+
 warnings.filterwarnings("ignore")
 
 # assign a global font size for the plots
@@ -19,42 +18,8 @@ plt.rcParams.update({"font.size": 16})
 # Functions ###################################################################
 
 
-def calc_scenario_stats(df: pd.DataFrame, target_column: str):
-    """ "
-    Calculate the frequency, PDF, and CDF of a target column in a dataframe
-
-    Parameters
-    ----------
-    df : pd.DataFrame
-        A pandas dataframe with the target column
-    target_column : str
-        The name of the target column in the dataframe
-
-    Returns
-    -------
-    stats_df : pd.DataFrame
-        A pandas dataframe with the frequency, PDF, and CDF of the target column
-    """
-    # filter out values of -9999 and zeros
-    df = df[df[target_column] != -9999]
-    df = df[df[target_column] > 0]
-    # Frequency
-    stats_df = (
-        df.groupby(target_column)[target_column]
-        .agg("count")
-        .pipe(pd.DataFrame)
-        .rename(columns={target_column: "frequency"})
-    )
-    # PDF
-    stats_df["pdf"] = stats_df["frequency"] / sum(stats_df["frequency"])
-    # CDF
-    stats_df["cdf"] = stats_df["pdf"].cumsum() * 100
-    stats_df = stats_df.reset_index()
-    return stats_df
-
-
 def plot_hist_cdf(
-    stats_df: pd.DataFrame,
+    values: np.ndarray,
     target_column: str,
     plot_title: str,
     threshold: float,
@@ -62,14 +27,14 @@ def plot_hist_cdf(
     output_path: str,
 ):
     """
-    Plot a histogram and CDF of a target column in a dataframe
+    Plot a histogram and CDF of the values of a target column
 
     Parameters
     ----------
-    stats_df : pd.DataFrame
-        A pandas dataframe with the frequency, PDF, and CDF of the target column
+    values : np.ndarray
+        The values of the target column for each cell, excluding nodata and zeros
     target_column : str
-        The name of the target column in the dataframe
+        The name of the target column
     plot_title : str
         The title of the plot
     threshold : float
@@ -78,29 +43,31 @@ def plot_hist_cdf(
         The number of bins for the histogram
     output_path : str
         The path to save the plot
+
+    Returns
+    -------
+    bool
+        True if the plot was saved, False if no values fall within the threshold
     """
+    # Bin the values between zero and the threshold
+    counts, edges = np.histogram(values, bins=num_bins, range=(0, threshold))
+    if counts.sum() == 0:
+        print(f"No {plot_title} values to plot below the threshold of {threshold}")
+        return False
 
-    fig, ax = plt.subplots(2, 1, sharex=True, figsize=(10, 10))
+    fig, ax = plt.subplots(2, 1, sharex=True, figsize=(10, 10), constrained_layout=True)
     ax = ax.flatten()
-    # plot the histogram
-    target_values = stats_df[target_column].values
-    filtered_values = target_values[(target_values <= threshold) & (target_values >= 0)]
-    weights = np.ones_like(filtered_values) / float(len(filtered_values)) * 100
-    n, bins, patches = ax[0].hist(
-        filtered_values,
-        bins=num_bins,
-        weights=weights,
-        range=(0, threshold),
-        density=False,
-    )
+    # plot the histogram as the percentage of cells within each uniform bin
+    percent = counts * (100.0 / counts.sum())
+    ax[0].bar(edges[:-1], percent, width=np.diff(edges), align="edge")
     # determine the percentage of cells that have errors greater than the threshold
     if target_column == "ttp_hrs":
         # cells with time to peak occuring within the last hour of the simulation
-        exceedance = int(len(target_values[target_values >= threshold]))
+        exceedance = int(np.count_nonzero(values >= threshold))
         plot_units = "hours"
     else:
         # cells with WSE errors greater than the threshold
-        exceedance = int(len(target_values[(target_values > threshold)]))
+        exceedance = int(np.count_nonzero(values > threshold))
         plot_units = "ft"
 
     ax[0].set(
@@ -120,18 +87,10 @@ def plot_hist_cdf(
             [f"{plot_title} > {threshold:.1f}: {exceedance} Cells"], loc="upper right"
         )
 
-    # plot the CDF
-    cdf_df = stats_df[
-        (stats_df[target_column] <= threshold) & (stats_df[target_column] >= 0)
-    ]
-    # Resample the data to num_bins equally spaced points
-    x = np.linspace(cdf_df[target_column].min(), cdf_df[target_column].max(), num_bins)
-    y = np.interp(
-        x, cdf_df[target_column].sort_values(), np.linspace(0, 100, len(cdf_df))
-    )
-    cdf_df = pd.DataFrame({target_column: x, "cdf": y})
+    # plot the CDF at the bin edges from the cumulative bin counts
+    cdf = np.concatenate(([0.0], np.cumsum(counts))) / counts.sum() * 100
 
-    ax[1].plot(cdf_df[target_column], cdf_df["cdf"], linewidth=3)
+    ax[1].plot(edges, cdf, linewidth=3)
     ax[1].set(
         xlabel=f"{plot_title} ({plot_units})",
         ylabel="P(X <= x) (%)",
@@ -148,11 +107,10 @@ def plot_hist_cdf(
         ax[1].xaxis.set_major_formatter(
             plt.FuncFormatter(lambda x, _: "{:.2f}".format(x))
         )
-    # add space between both subplots
-    plt.tight_layout()
     # save the plot
     plt.savefig(output_path)
     plt.close(fig)
+    return True
 
 
 def wse_error_qc(
@@ -180,26 +138,27 @@ def wse_error_qc(
     bool
         True if the max WSE errors were processed successfully, False
     """
+    # Filter the max WSE errors to the cells with errors
+    wse_errors = cell_points_gdf["max_ws_err"].to_numpy()
+    wse_errors = wse_errors[(wse_errors != -9999) & (wse_errors > 0)]
+
     # Process Max WSE Errors and export graphics
     if len(cell_points_gdf) == 0:
         print("No cells found in the HDF file")
         return False
-    elif len(cell_points_gdf[cell_points_gdf["max_ws_err"] > 0]) == 0:
+    elif len(wse_errors) == 0:
         print("No cells with WSE errors greater than zero")
         return False
     else:
-        # Calculate the frequency, PDF, and CDF of the max WSE errors
-        cell_stats_df = calc_scenario_stats(cell_points_gdf, "max_ws_err")
         # Plot the histogram and CDF of the max WSE errors
-        plot_hist_cdf(
-            cell_stats_df,
+        return plot_hist_cdf(
+            wse_errors,
             "max_ws_err",
             "Max WSE Error",
             wse_error_threshold,
             num_bins,
             output_path,
         )
-        return True
 
 
 def wse_ttp_qc(cell_points_gdf: gpd.GeoDataFrame, num_bins: int, output_path: str):
@@ -225,31 +184,23 @@ def wse_ttp_qc(cell_points_gdf: gpd.GeoDataFrame, num_bins: int, output_path: st
         print("No cells found in the HDF file")
         return False
 
-    # Determine the global min time to peak for the simulation start time
-    start_time = cell_points_gdf["min_ws_time"].min()
-    # find the time to peak between the max and min water surface elevation times
-    ttp = cell_points_gdf["max_ws_time"] - start_time
-    # convert to hours
-    ttp = ttp.dt.total_seconds() / 3600
-    ttp = ttp.to_frame()
-    ttp.columns = ["ttp_hrs"]
+    # Find the time to peak (hours) of each cell with a positive time to peak
+    ttp_hrs = calc_time_to_peak(cell_points_gdf)
+    ttp_hrs = ttp_hrs[ttp_hrs > 0]
 
-    if len(ttp[ttp["ttp_hrs"] > 0]) == 0:
+    if len(ttp_hrs) == 0:
         print("No cells with time to peak greater than zero")
         return False
     else:
         # Define the global max time to peak
-        ttp_max = ttp["ttp_hrs"].max()
+        ttp_max = ttp_hrs.max()
         cell_points_gdf = None
-        # Calculate the frequency, PDF, and CDF of the time to peak
-        cell_stats_df = calc_scenario_stats(ttp, "ttp_hrs")
         # Plot the histogram and CDF of the time to peak
-        plot_hist_cdf(
-            cell_stats_df,
+        return plot_hist_cdf(
+            ttp_hrs,
             "ttp_hrs",
             "Time to Peak",
             ttp_max,
             num_bins,
             output_path,
         )
-        return True
@@ -2,10 +2,15 @@
 
 # Imports #####################################################################
 import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-from shapely.geometry import Point
+import pyarrow.parquet as pq
 import geopandas as gpd
 import py3dep
 from pygeohydro import (
@@ -19,9 +24,62 @@ import xml.etree.ElementTree as ET
 import pygeohydro as gh
 from pynhd import HP3D, WaterData, NHDPlusHR
 
+# Shared HTTP session, so the server availability checks reuse pooled connections
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# 3DEP DEM resolutions (m), in order of preference
+_DEM_RESOLUTIONS = (60, 30, 10, 5, 3)
+
+# Columns read from the NID Parquet file
+_NID_COLUMNS = ["latitude", "longitude", "damHeight", "nidId", "name"]
+
+# NWIS parameter codes for each gage variable type
+_PARAM_CDS = {
+    "flow": "00060",  # discharge in cubic feet per second
+    "stage": "00065",  # gage height in feet
+}
+
+# Hydrography sources for the flowlines, in order of preference
+_FLOWLINE_SOURCES = {
+    "NHD": partial(WaterData, "nhdflowline_network"),
+    "NHDPlus HR": partial(NHDPlusHR, "flowline"),
+    "3DHP": partial(HP3D, "flowline"),
+}
+
 # Functions ###################################################################
 
 
+@lru_cache(maxsize=128)
+def _check_3dep_availability(bbox: tuple):
+    """
+    Check the 3DEP DEM resolutions available within a bounding box, once per box
+
+    Parameters
+    ----------
+    bbox : tuple
+        The (minx, miny, maxx, maxy) bounding box
+
+    Returns
+    -------
+    dict
+        The availability of each 3DEP resolution. Callers must not modify it.
+    """
+    return py3dep.check_3dep_availability(bbox)
+
+
 def get_dem_data(model_perimeter: gpd.GeoDataFrame):
     """
     Get the DEM data within the model perimeter
@@ -38,36 +96,15 @@ def get_dem_data(model_perimeter: gpd.GeoDataFrame):
     """
     # Get the bounding box of the model perimeter
     bbox = tuple(model_perimeter.bounds.values[0])
-    # Check for DEM availability
-    dem_availability = py3dep.check_3dep_availability(bbox)
-    if dem_availability["60m"]:
-        print("60 m DEM is available")
-        res = 60
-        dem = py3dep.get_dem(bbox, res)
-        return dem
-    elif dem_availability["30m"]:
-        print("30 m DEM is available")
-        res = 30
-        dem = py3dep.get_dem(bbox, res)
-        return dem
-    elif dem_availability["10m"]:
-        print("10 m DEM is available")
-        res = 10
-        dem = py3dep.get_dem(bbox, res)
-        return dem
-    elif dem_availability["5m"]:
-        print("5 m DEM is available")
-        res = 5
-        dem = py3dep.get_dem(bbox, res)
-        return dem
-    elif dem_availability["3m"]:
-        print("3 m DEM is available")
-        res = 3
-        dem = py3dep.get_dem(bbox, res)
-        return dem
-    else:
-        print("No DEM available")
-        dem = None
+    # Check for DEM availability, on a bounding box rounded to ~11 m to reuse the result
+    dem_availability = _check_3dep_availability(tuple(round(float(b), 4) for b in bbox))
+    # Retrieve the coarsest resolution that is available
+    for res in _DEM_RESOLUTIONS:
+        if dem_availability[f"{res}m"]:
+            print(f"{res} m DEM is available")
+            return py3dep.get_dem(bbox, res)
+    print("No DEM available")
+    return None
 
 
 def get_nhd_flowlines(model_perimeter: gpd.GeoDataFrame):
@@ -84,33 +121,41 @@ def get_nhd_flowlines(model_perimeter: gpd.GeoDataFrame):
     gpd.GeoDataFrame
         The NHD flowlines within the model perimeter
     """
-    try:
-        # Create an instance of the NHDPlus MR class
-        nhd_mr = WaterData("nhdflowline_network")
-        # Query the NHD flowlines that intersect the model perimeter
-        flowlines = nhd_mr.bygeom(model_perimeter.geometry.iloc[0], model_perimeter.crs)
-        return flowlines
-    except Exception as e:
-        print(f"Failed retrieving flowlines from NHD")
-        print("Attempting to retrieve flowlines from the local NHDPlus HR dataset...")
-    try:
-        # Create an instance of the NHDPlus HR class
-        nhd_hr = NHDPlusHR("flowline")
-        # Query the NHDPlus HR flowlines that intersect the model perimeter
-        flowlines = nhd_hr.bygeom(model_perimeter.geometry.iloc[0], model_perimeter.crs)
-        return flowlines
-    except Exception as e:
-        print(f"Failed retrieving flowlines from NHDPlus HR:")
-        print("Attempting to retrieve flowlines from 3DHP...")
-    try:
-        # Create an instance of the 3DHP class
-        hp3d = HP3D("flowline")
-        # Query the 3DHP flowlines that intersect the model perimeter
-        flowlines = hp3d.bygeom(model_perimeter.geometry.iloc[0], model_perimeter.crs)
+    # Query the sources in order of preference, falling back to the next source
+    # once a query fails. Each service applies its own request timeouts.
+    for name, source in _FLOWLINE_SOURCES.items():
+        try:
+            flowlines = source().bygeom(
+                model_perimeter.geometry.iloc[0], model_perimeter.crs
+            )
+        except Exception as e:
+            print(f"Failed retrieving flowlines from {name}: {e}")
+            error = e
+            continue
+        print(f"Retrieved the flowlines from {name}")
         return flowlines
-    except Exception as e:
-        return_statement = f"Data Unavailable: {e}"
-        return return_statement
+    return_statement = f"Data Unavailable: {error}"
+    return return_statement
+
+
+def _server_status(url: str):
+    """
+    Probe a server with a GET request, reading only the response headers. Some
+    servers refuse HEAD requests (405 or 403) for URLs that serve GET requests.
+
+    Parameters
+    ----------
+    url : str
+        The URL to probe
+
+    Returns
+    -------
+    int
+        The HTTP status code of the response
+    """
+    # Stream the response so that the body is never downloaded
+    with _SESSION.get(url, timeout=5, stream=True) as response:
+        return response.status_code
 
 
 def get_nid_dams(model_perimeter: gpd.GeoDataFrame):
@@ -129,15 +174,17 @@ def get_nid_dams(model_perimeter: gpd.GeoDataFrame):
     """
     # First check if the NID server is available
     url = "https://nid.sec.usace.army.mil/api/nation/gpkg"
-    response = requests.get(url)
-    response.status_code
-    if response.status_code != 200:
-        print(
-            f"NID server is currently unavailable. Server Code: {response.status_code}"
-        )
+    # Request only the headers, rather than downloading the national dataset
+    try:
+        status_code = _server_status(url)
+    except requests.RequestException as e:
+        print(f"NID server is currently unavailable. {e}")
+        return None
+    if status_code != 200:
+        print(f"NID server is currently unavailable. Server Code: {status_code}")
         return None
     else:
-        print(f"NID server is available. Server Code: {response.status_code}")
+        print(f"NID server is available. Server Code: {status_code}")
         try:
             # Create an instance of the NID class
             nid = gh.NID()
@@ -157,10 +204,57 @@ def get_nid_dams(model_perimeter: gpd.GeoDataFrame):
             return None
 
 
+@lru_cache(maxsize=4)
+def _read_nid_parquet(
+    parquet_file_path: str,
+    mtime: float,
+    height_threshold: int,
+    bbox: Optional[tuple],
+):
+    """
+    Read the NID Parquet file, pushing the column selection and the height and
+    bounding box filters down to the Parquet reader. The file's modification
+    time is part of the cache key, so an updated file is read again.
+
+    Parameters
+    ----------
+    parquet_file_path : str
+        The path to the Parquet file containing the NID data.
+    mtime : float
+        The modification time of the Parquet file.
+    height_threshold : int
+        The vertical dam height threshold to filter the NID data by.
+    bbox : tuple
+        The (minx, miny, maxx, maxy) bounding box in EPSG:4326, or None
+
+    Returns
+    -------
+    nid_df : pd.DataFrame
+        The NID dams that pass the filters. Callers must not modify it in place.
+    """
+    filters = [("damHeight", ">=", height_threshold)]
+    if bbox is not None:
+        minx, miny, maxx, maxy = bbox
+        filters += [
+            ("longitude", ">=", minx),
+            ("longitude", "<=", maxx),
+            ("latitude", ">=", miny),
+            ("latitude", "<=", maxy),
+        ]
+    # Ensure the point data has 'latitude' and 'longitude' columns
+    columns = pq.read_schema(parquet_file_path).names
+    if "latitude" not in columns or "longitude" not in columns:
+        raise ValueError(
+            "The Parquet file must contain 'latitude' and 'longitude' columns."
+        )
+    return pd.read_parquet(parquet_file_path, columns=_NID_COLUMNS, filters=filters)
+
+
 def filter_nid(
     parquet_file_path: str,
     model_perimeter: gpd.GeoDataFrame,
     height_threshold: int = 50,
+    bbox: Optional[tuple] = None,
 ):
     """
     Filter the National Inventory of Dams (NID) data to only include points
@@ -174,6 +268,10 @@ def filter_nid(
         The GeoDataFrame representing the model perimeter.
     height_threshold : int
         The vertical dam height threshold to filter the NID data by.
+    bbox : tuple, optional
+        The (minx, miny, maxx, maxy) bounding box in EPSG:4326. Only the rows
+        within the box are read from the Parquet file. Defaults to the bounds
+        of the model perimeter.
 
     Returns
     -------
@@ -181,23 +279,21 @@ def filter_nid(
         A GeoDataFrame containing the filtered NID data.
     """
 
-    # Read the Parquet file containing point data
-    nid_df = pd.read_parquet(parquet_file_path)
-    # Columns in the Parquet file: ['name', 'latitude', 'longitude', 'nidId', 'damHeight']
-
-    # Filter to the points with a height greater or equal to the threshold
-    nid_df = nid_df[nid_df["damHeight"] >= height_threshold]
-    # Remove any dams with missing height values
-    nid_df = nid_df.dropna(subset=["damHeight"])
-
-    # Ensure the point data has 'latitude' and 'longitude' columns
-    if "latitude" not in nid_df.columns or "longitude" not in nid_df.columns:
-        raise ValueError(
-            "The Parquet file must contain 'latitude' and 'longitude' columns."
-        )
-
-    # Filter to only the core columns of interest
-    nid_df = nid_df[["latitude", "longitude", "damHeight", "nidId", "name"]]
+    # Only read the dams within the bounding box of the model perimeter
+    if bbox is None:
+        if model_perimeter.crs is None:
+            bbox = model_perimeter.total_bounds
+        else:
+            bbox = model_perimeter.to_crs("EPSG:4326").total_bounds
+    # Read the Parquet file containing point data, cached until the file changes
+    nid_df = _read_nid_parquet(
+        parquet_file_path,
+        os.path.getmtime(parquet_file_path),
+        height_threshold,
+        tuple(float(b) for b in bbox),
+    )
+    # The reader has already dropped the dams below the height threshold or with a
+    # missing height, and kept only the core columns of interest
 
     if len(nid_df) == 0:
         return None
@@ -205,7 +301,7 @@ def filter_nid(
         # Convert the point data to a GeoDataFrame
         nid_gdf = gpd.GeoDataFrame(
             nid_df,
-            geometry=[Point(xy) for xy in zip(nid_df.longitude, nid_df.latitude)],
+            geometry=gpd.points_from_xy(nid_df.longitude, nid_df.latitude),
             crs="EPSG:4326",  # Assuming the coordinates are in WGS84
         )
         # Perform a spatial join to filter points within the polygon
@@ -234,15 +330,20 @@ def get_nlcd_data(model_perimeter: gpd.GeoDataFrame, resolution: int, year: int)
     """
     # First test if the NLCD server is available
     url = f"https://www.mrlc.gov/geoserver/mrlc_display/NLCD_{year}_Land_Cover_L48/wms?"
-    response = requests.get(url)
+    # Request only the headers, rather than downloading the capabilities document
+    try:
+        status_code = _server_status(url)
+    except requests.RequestException as e:
+        return_statement = f"NLCD server is currently unavailable. {e}"
+        return return_statement
 
-    if response.status_code != 200:
+    if status_code != 200:
         return_statement = (
-            f"NLCD server is currently unavailable. Server Code: {response.status_code}"
+            f"NLCD server is currently unavailable. Server Code: {status_code}"
         )
         return return_statement
     else:
-        print(f"NLCD server is available. Server Code: {response.status_code}")
+        print(f"NLCD server is available. Server Code: {status_code}")
         try:
             # Retrieve the NLCD data at the specified resolution and year
             nlcd = gh.nlcd_bygeom(model_perimeter, resolution, years={"cover": year})[0]
@@ -286,10 +387,13 @@ def get_usgs_stations(
 
     # Get the bounding box of the model perimeter
     bbox = tuple(model_perimeter.bounds.values[0])  # (minx, miny, maxx, maxy)
-    if variable_type == "flow":
-        parameter_cd = "00060" # discharge in cubic feet per second
-    elif variable_type == "stage":
-        parameter_cd = "00065" # gage height in feet
+    # Look up the NWIS parameter code for the variable type
+    if variable_type not in _PARAM_CDS:
+        raise ValueError(
+            f"Unsupported variable type '{variable_type}'. "
+            f"Expected one of: {', '.join(_PARAM_CDS)}"
+        )
+    parameter_cd = _PARAM_CDS[variable_type]
     # Query gage stations with daily values
     query_dv = {
         "bBox": ",".join(f"{b:.06f}" for b in bbox),
@@ -297,8 +401,6 @@ def get_usgs_stations(
         "outputDataTypeCd": "dv",
         "parameterCd": parameter_cd,
     }
-    info_box_dv = nwis.get_info(query_dv)
-
     # Query gage stations with instantaneous values
     query_iv = {
         "bBox": ",".join(f"{b:.06f}" for b in bbox),
@@ -306,7 +408,11 @@ def get_usgs_stations(
         "outputDataTypeCd": "iv",
         "parameterCd": parameter_cd,
     }
-    info_box_iv = nwis.get_info(query_iv)
+    # Send both independent queries to the server concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_dv = executor.submit(nwis.get_info, query_dv)
+        future_iv = executor.submit(nwis.get_info, query_iv)
+        info_box_dv, info_box_iv = future_dv.result(), future_iv.result()
 
     if dates is None:
         # Don't filter the gage stations by date
@@ -336,9 +442,12 @@ def get_usgs_stations(
     )
     # Filter the gages to only include those within the model perimeter
     # This is necesarry since the NWIS() class only support query by rectangular bbox
-    df_gages_usgs = df_gages_usgs[
-        df_gages_usgs.within(model_perimeter.geometry.iloc[0])
-    ]
+    df_gages_usgs = gpd.sjoin(
+        df_gages_usgs,
+        model_perimeter[["geometry"]].iloc[:1].reset_index(drop=True),
+        predicate="within",
+        how="inner",
+    ).drop(columns="index_right")
     return df_gages_usgs.reset_index(drop=True)
 
 
@@ -54,8 +54,20 @@ def fill_gage_table(report_keywords: dict, df_gages_usgs: pd.DataFrame):
     report_keywords : dict
         Updated dictionary containing the report keywords.
     """
+    # No gages to fill the table with
+    if len(df_gages_usgs) == 0:
+        return report_keywords
     df_gages_usgs = df_gages_usgs.reset_index(drop=True)
     nwis = NWIS()
+    # Query the site info for all stations in a single request
+    try:
+        all_info = nwis.get_info(
+            {"site": ",".join(df_gages_usgs["site_no"].astype(str))}, expanded=True
+        )
+        all_info = all_info.drop_duplicates(subset="site_no").set_index("site_no")
+    except Exception as e:
+        print(f"Error retrieving site info for the USGS gages: {e}")
+        all_info = pd.DataFrame(columns=["drain_area_va"])
     for idx, row in df_gages_usgs.iterrows():
         station_id = row["site_no"]  # 08059590
         station_name = row["station_nm"]  # Willow Creek at Highway 80
@@ -66,8 +78,7 @@ def fill_gage_table(report_keywords: dict, df_gages_usgs: pd.DataFrame):
         report_keywords[f"table03_gage0{idx+1}_id"] = station_id
         report_keywords[f"table03_gage0{idx+1}_por"] = f"{begin_date}-{end_date}"
         try:
-            site_info = nwis.get_info({"site": station_id}, expanded=True)
-            drainage_area = site_info["drain_area_va"].values[0]  # square miles
+            drainage_area = all_info.at[station_id, "drain_area_va"]  # square miles
             report_keywords[f"table03_gage0{idx+1}_area"] = f"{drainage_area:,}"
         except Exception as e:
             print(f"Error retrieving site info for {station_id}: {e}")
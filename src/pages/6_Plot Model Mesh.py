@@ -21,7 +21,12 @@ rootDir = os.path.abspath(os.path.join(srcDir, ".."))
 # Define the data directory as the assets folder within the src directory
 dataDir = os.path.join(srcDir, "assets")
 
-from hdf_utils import get_model_perimeter, get_model_breaklines, get_model_cell_polygons
+from hdf_utils import (
+    cached_ras_hdf_files,
+    get_model_perimeter,
+    get_model_breaklines,
+    get_model_cell_polygons,
+)
 from figures import plot_model_mesh
 
 # layout options: wide mode, centered mode
@@ -58,15 +63,18 @@ if __name__ == "__main__":
     st.write("Click the button below to generate the figure.")
     if st.button("Begin Figure Generation"):
         if GEOM_HDF_PATH is not None:
-            # Get the model geometry
-            model_perimeter = get_model_perimeter(
-                GEOM_HDF_PATH, DOMAIN_ID, project_to_4326=True
-            )
+            # Get the model geometry, reading the HDF file through one handle
+            with cached_ras_hdf_files():
+                model_perimeter = get_model_perimeter(
+                    GEOM_HDF_PATH, DOMAIN_ID, project_to_4326=True
+                )
+                model_breaklines = get_model_breaklines(
+                    GEOM_HDF_PATH, project_to_4326=True
+                )
+                model_cell_polygons = get_model_cell_polygons(
+                    GEOM_HDF_PATH, project_to_4326=True
+                )
             domain_name = model_perimeter["mesh_name"].values[0]
-            model_breaklines = get_model_breaklines(GEOM_HDF_PATH, project_to_4326=True)
-            model_cell_polygons = get_model_cell_polygons(
-                GEOM_HDF_PATH, project_to_4326=True
-            )
             # Plot the Model Mesh
             img_path = plot_model_mesh(
                 model_perimeter,
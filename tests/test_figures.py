@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Imports #####################################################################
+
+import io
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import matplotlib.pyplot as plt
+import pytest
+from docx import Document
+from shapely.geometry import LineString, Point
+
+import figures
+
+# Tests #######################################################################
+
+
+def _png_stream():
+    # A small in-memory PNG to insert into a document
+    fig = plt.figure(figsize=(1, 1))
+    stream = io.BytesIO()
+    fig.savefig(stream, format="png")
+    plt.close(fig)
+    stream.seek(0)
+    return stream
+
+
+def test_monthly_mean_matches_pandas():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2000-01-01", periods=1000, freq="D")
+    values = rng.random(len(dates))
+    values[::7] = np.nan
+    expected = pd.Series(values, index=dates).groupby(dates.month).mean()
+
+    monthly = figures._monthly_mean(dates, values)
+
+    assert list(monthly.index) == list(expected.index)
+    np.testing.assert_allclose(monthly.to_numpy(), expected.to_numpy())
+
+
+def test_monthly_mean_skips_missing_months():
+    dates = pd.to_datetime(["2020-01-01", "2020-01-02", "2020-03-01"])
+    values = np.array([1.0, 3.0, np.nan])
+
+    monthly = figures._monthly_mean(dates, values)
+
+    # March is present with only missing values, February is absent
+    assert list(monthly.index) == [1, 3]
+    assert monthly[1] == 2.0
+    assert np.isnan(monthly[3])
+
+
+def test_annual_max_matches_pandas():
+    rng = np.random.default_rng(1)
+    dates = pd.date_range("2000-06-01", periods=1500, freq="D")
+    values = rng.random(len(dates))
+    values[::5] = np.nan
+    expected = pd.Series(values, index=dates).groupby(dates.year).max()
+
+    annual = figures._annual_max(dates, values)
+
+    assert list(annual.index) == list(expected.index)
+    np.testing.assert_allclose(annual.to_numpy(), expected.to_numpy())
+
+
+def test_annual_max_empty():
+    annual = figures._annual_max(pd.DatetimeIndex([]), np.array([]))
+    assert len(annual) == 0
+
+
+def test_add_image_to_keyword_inserts_before_each_match():
+    document = Document()
+    document.add_paragraph("Figure «figure_dem» above")
+    document.add_paragraph("No keyword here")
+    document.add_paragraph("Again «FIGURE_DEM»")
+    document.add_paragraph("Other «figure_nlcd»")
+
+    figures.add_image_to_keyword(document, "«figure_dem»", _png_stream())
+    figures.add_image_to_keyword(document, "«figure_nlcd»", _png_stream())
+
+    texts = [para.text for para in document.paragraphs]
+    assert len(document.inline_shapes) == 3
+    # Each image is in a new paragraph directly before its keyword
+    for keyword in ["«figure_dem»", "«figure_nlcd»"]:
+        for idx, text in enumerate(texts):
+            if keyword in text.lower():
+                assert texts[idx - 1] == ""
+
+
+def test_plot_hist_cdf_saves_plot():
+    stream = io.BytesIO()
+    values = np.array([0.1, 0.2, 0.5, 3.0], dtype=np.float32)
+
+    assert figures.plot_hist_cdf(values, "max_ws_err", "Max WSE Error", 1.0, 10, stream)
+    assert stream.getvalue().startswith(b"\x89PNG")
+
+
+def test_plot_hist_cdf_skips_values_above_threshold():
+    stream = io.BytesIO()
+    values = np.array([2.0, 3.0], dtype=np.float32)
+
+    assert not figures.plot_hist_cdf(
+        values, "max_ws_err", "Max WSE Error", 1.0, 10, stream
+    )
+    assert stream.getvalue() == b""
+
+
+# The gages and reference lines are matched in EPSG:4326, as in plot_hydrographs
+@pytest.mark.filterwarnings("ignore:Geometry is in a geographic CRS")
+def test_match_gages():
+    ref_lines = gpd.GeoDataFrame(
+        {"refln_id": ["near", "far"]},
+        geometry=[LineString([(0, 0), (0, 1)]), LineString([(5, 0), (5, 1)])],
+        crs="EPSG:4326",
+    )
+    df_gages_usgs = gpd.GeoDataFrame(
+        {"site_no": ["08000001", "08000002"]},
+        geometry=[Point(0.005, 0.5), Point(2, 2)],
+        crs="EPSG:4326",
+    )
+
+    gage_matches = figures._match_gages(ref_lines, df_gages_usgs, 0.01)
+
+    matches = gage_matches.set_index("refln_id")
+    assert matches.loc["near", "site_no"] == "08000001"
+    assert matches.loc["near", "index_right"] == 0
+    assert np.isclose(matches.loc["near", "gage_distance"], 0.005)
+    # No gage within the search distance of the far line
+    assert pd.isna(matches.loc["far", "index_right"])
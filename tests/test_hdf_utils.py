@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Imports #####################################################################
+
+from concurrent.futures import ThreadPoolExecutor
+import h5py
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import LineString, Point, Polygon
+from pyproj import CRS
+from rashdf import RasGeomHdf
+
+import hdf_utils
+
+# Texas North Central State Plane (US feet), as used by the Trinity models
+SRC_CRS = "EPSG:2276"
+
+# Tests #######################################################################
+
+
+def _sample_gdf(offset: float = 0.0):
+    # A point, a line and a polygon near Dallas, in US feet
+    x0, y0 = 2_480_000.0 + offset, 6_970_000.0
+    return gpd.GeoDataFrame(
+        {"name": ["point", "line", "polygon"]},
+        geometry=[
+            Point(x0, y0),
+            LineString([(x0, y0), (x0 + 1000, y0 + 500)]),
+            Polygon([(x0, y0), (x0 + 500, y0), (x0 + 500, y0 + 500)]),
+        ],
+        crs=SRC_CRS,
+    )
+
+
+def _assert_geometries_close(result: gpd.GeoDataFrame, expected: gpd.GeoDataFrame):
+    assert result.crs == expected.crs
+    for geom, expected_geom in zip(result.geometry, expected.geometry):
+        assert geom.geom_type == expected_geom.geom_type
+        assert geom.equals_exact(expected_geom, tolerance=1e-9)
+
+
+def test_reproject_matches_to_crs():
+    gdf = _sample_gdf()
+
+    result = hdf_utils._reproject(gdf, "EPSG:4326")
+
+    _assert_geometries_close(result, gdf.to_crs("EPSG:4326"))
+    assert list(result["name"]) == ["point", "line", "polygon"]
+    # The input frame is left unchanged
+    assert gdf.crs == SRC_CRS
+
+
+def test_reproject_skips_empty_and_same_crs():
+    empty = gpd.GeoDataFrame(geometry=[], crs=SRC_CRS)
+    assert hdf_utils._reproject(empty, "EPSG:4326").crs == "EPSG:4326"
+
+    gdf = _sample_gdf().to_crs("EPSG:4326")
+    result = hdf_utils._reproject(gdf, "EPSG:4326")
+    _assert_geometries_close(result, gdf)
+
+
+def test_reproject_many_matches_to_crs():
+    gdfs = [
+        _sample_gdf(),
+        _sample_gdf(offset=5000),
+        gpd.GeoDataFrame(geometry=[], crs=SRC_CRS),
+        # A frame in another CRS is reprojected on its own
+        _sample_gdf().to_crs("EPSG:3857"),
+    ]
+
+    results = hdf_utils._reproject_many(gdfs, "EPSG:4326")
+
+    assert len(results) == len(gdfs)
+    for result, gdf in zip(results, gdfs):
+        if gdf.empty:
+            assert result.empty and result.crs == "EPSG:4326"
+        else:
+            _assert_geometries_close(result, gdf.to_crs("EPSG:4326"))
+
+
+def test_proj_table_from_wkt():
+    proj_table = hdf_utils._proj_table_from_wkt(CRS(SRC_CRS).to_wkt())
+
+    assert proj_table["projcs"] == "NAD83 / Texas North Central (ftUS)"
+    assert proj_table["geogcs"] == "NAD83"
+    assert proj_table["ellipsoid"] == "GRS 1980"
+    assert proj_table["method"] == "Lambert Conic Conformal (2SP)"
+    assert proj_table["authority"] == "EPSG"
+    assert proj_table["unit"] == "US survey foot"
+
+
+def test_proj_table_from_wkt_named_unit():
+    # Metre units are given by name only in the PROJJSON
+    proj_table = hdf_utils._proj_table_from_wkt(CRS("EPSG:32614").to_wkt())
+
+    assert proj_table["unit"] == "metre"
+    assert proj_table["method"] == "Transverse Mercator"
+
+
+def test_calc_time_to_peak():
+    cell_points = pd.DataFrame(
+        {
+            "min_ws_time": pd.to_datetime(
+                ["2020-01-01 00:00", "2020-01-01 01:00", None]
+            ),
+            "max_ws_time": pd.to_datetime(
+                ["2020-01-01 05:30", None, "2020-01-02 00:00"]
+            ),
+        }
+    )
+
+    ttp_hrs = hdf_utils.calc_time_to_peak(cell_points)
+
+    np.testing.assert_allclose(ttp_hrs, [5.5, np.nan, 24.0])
+
+
+def test_calc_time_to_peak_without_start_time():
+    cell_points = pd.DataFrame(
+        {
+            "min_ws_time": pd.Series([pd.NaT, pd.NaT], dtype="datetime64[ns]"),
+            "max_ws_time": pd.to_datetime(["2020-01-01", "2020-01-02"]),
+        }
+    )
+
+    assert np.isnan(hdf_utils.calc_time_to_peak(cell_points)).all()
+
+
+def _write_hdf(tmp_path):
+    hdf_file_path = str(tmp_path / "model.g01.hdf")
+    with h5py.File(hdf_file_path, "w") as hdf:
+        hdf["data"] = np.arange(3)
+    return hdf_file_path
+
+
+def test_open_ras_hdf_closes_on_exit(tmp_path):
+    hdf_file_path = _write_hdf(tmp_path)
+
+    with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as hdf:
+        assert hdf.id.valid
+        with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as other:
+            assert other is not hdf
+
+    assert not hdf.id.valid and not other.id.valid
+
+
+def test_cached_ras_hdf_files_shares_handle_until_exit(tmp_path):
+    hdf_file_path = _write_hdf(tmp_path)
+
+    with hdf_utils.cached_ras_hdf_files():
+        with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as hdf:
+            pass
+        # The file stays open for the other reads of the block
+        assert hdf.id.valid
+        with hdf_utils.cached_ras_hdf_files():
+            with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as nested:
+                assert nested is hdf
+        assert hdf.id.valid
+
+    assert not hdf.id.valid
+
+
+def test_cached_ras_hdf_files_per_thread(tmp_path):
+    hdf_file_path = _write_hdf(tmp_path)
+
+    def read_in_thread():
+        with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as hdf:
+            return hdf
+
+    with hdf_utils.cached_ras_hdf_files():
+        with hdf_utils.open_ras_hdf(hdf_file_path, RasGeomHdf) as hdf:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                thread_hdf = executor.submit(read_in_thread).result()
+        # Another thread neither shares nor closes the files of this block
+        assert thread_hdf is not hdf
+        assert not thread_hdf.id.valid
+        assert hdf.id.valid
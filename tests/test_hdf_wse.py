@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# Imports #####################################################################
+
+import pandas as pd
+
+import hdf_wse
+
+# Tests #######################################################################
+
+
+def test_wse_error_qc_plots_cell_errors(tmp_path):
+    output_path = str(tmp_path / "wse_errors.png")
+    cell_points = pd.DataFrame({"max_ws_err": [-9999.0, 0.0, 0.1, 0.1, 0.4, 2.0]})
+
+    assert hdf_wse.wse_error_qc(cell_points, 1.0, 10, output_path)
+    with open(output_path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_wse_error_qc_without_errors(tmp_path):
+    output_path = str(tmp_path / "wse_errors.png")
+    cell_points = pd.DataFrame({"max_ws_err": [-9999.0, 0.0]})
+
+    assert not hdf_wse.wse_error_qc(cell_points, 1.0, 10, output_path)
+
+
+def test_wse_ttp_qc_plots_time_to_peak(tmp_path):
+    output_path = str(tmp_path / "wse_ttp.png")
+    cell_points = pd.DataFrame(
+        {
+            "min_ws_time": pd.to_datetime(["2020-01-01 00:00"] * 3),
+            "max_ws_time": pd.to_datetime(
+                ["2020-01-01 00:00", "2020-01-01 02:00", "2020-01-01 06:00"]
+            ),
+        }
+    )
+
+    assert hdf_wse.wse_ttp_qc(cell_points, 10, output_path)
+    with open(output_path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
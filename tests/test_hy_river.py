@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Imports #####################################################################
+
+import os
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+
+import hy_river
+
+# Tests #######################################################################
+
+
+@pytest.fixture(autouse=True)
+def clear_nid_cache():
+    hy_river._read_nid_parquet.cache_clear()
+    yield
+    hy_river._read_nid_parquet.cache_clear()
+
+
+@pytest.fixture
+def model_perimeter():
+    # A triangle, so that its bounding box holds points outside of it
+    return gpd.GeoDataFrame(
+        {"mesh_name": ["Denton"]},
+        geometry=[Polygon([(-97.0, 33.0), (-96.0, 33.0), (-97.0, 34.0)])],
+        crs="EPSG:4326",
+    )
+
+
+def _write_nid(path, dams: dict):
+    pd.DataFrame(dams).to_parquet(path)
+    return str(path)
+
+
+def _nid_dams():
+    return {
+        "name": ["Inside", "Short", "No Height", "Outside Box", "Outside Shape"],
+        "latitude": [33.2, 33.2, 33.2, 40.0, 33.9],
+        "longitude": [-96.8, -96.8, -96.8, -96.8, -96.1],
+        "nidId": ["TX001", "TX002", "TX003", "TX004", "TX005"],
+        "damHeight": [60.0, 10.0, np.nan, 80.0, 70.0],
+    }
+
+
+def test_filter_nid(tmp_path, model_perimeter):
+    parquet_file_path = _write_nid(tmp_path / "nid.parquet", _nid_dams())
+
+    nid_gdf = hy_river.filter_nid(parquet_file_path, model_perimeter, 50)
+
+    assert list(nid_gdf["nidId"]) == ["TX001"]
+    assert list(nid_gdf.columns[:5]) == hy_river._NID_COLUMNS
+    assert nid_gdf.crs == "EPSG:4326"
+    assert nid_gdf.geometry.iloc[0].coords[0] == (-96.8, 33.2)
+
+
+def test_filter_nid_bbox_pushdown(tmp_path, model_perimeter):
+    parquet_file_path = _write_nid(tmp_path / "nid.parquet", _nid_dams())
+
+    hy_river.filter_nid(parquet_file_path, model_perimeter, 50)
+    nid_df = hy_river._read_nid_parquet(
+        parquet_file_path,
+        os.path.getmtime(parquet_file_path),
+        50,
+        tuple(float(b) for b in model_perimeter.total_bounds),
+    )
+
+    # The reader drops short, heightless and out of the box dams, and is cached
+    assert list(nid_df["nidId"]) == ["TX001", "TX005"]
+    assert hy_river._read_nid_parquet.cache_info().hits == 1
+
+
+def test_filter_nid_no_dams(tmp_path, model_perimeter):
+    parquet_file_path = _write_nid(tmp_path / "nid.parquet", _nid_dams())
+
+    assert hy_river.filter_nid(parquet_file_path, model_perimeter, 500) is None
+
+
+def test_filter_nid_rereads_updated_file(tmp_path, model_perimeter):
+    parquet_file_path = _write_nid(tmp_path / "nid.parquet", _nid_dams())
+    assert len(hy_river.filter_nid(parquet_file_path, model_perimeter, 50)) == 1
+
+    dams = _nid_dams()
+    dams["damHeight"][1] = 55.0
+    _write_nid(parquet_file_path, dams)
+    mtime = os.path.getmtime(parquet_file_path) + 10
+    os.utime(parquet_file_path, (mtime, mtime))
+
+    nid_gdf = hy_river.filter_nid(parquet_file_path, model_perimeter, 50)
+    assert list(nid_gdf["nidId"]) == ["TX001", "TX002"]
+
+
+def test_filter_nid_requires_coordinates(tmp_path, model_perimeter):
+    dams = _nid_dams()
+    del dams["latitude"]
+    parquet_file_path = _write_nid(tmp_path / "nid.parquet", dams)
+
+    with pytest.raises(ValueError, match="latitude"):
+        hy_river.filter_nid(parquet_file_path, model_perimeter, 50)